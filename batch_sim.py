@@ -0,0 +1,140 @@
+import numpy as np
+from scheduler_sim import SchedulerType, SchedulingMode
+
+_NEVER = np.iinfo(np.int64).max
+
+class LockstepBatch:
+    """K task sets sharing the same task names, simulated together in NumPy.
+
+    Every per-task value is a K x N array and each loop iteration is one iteration of
+    Scheduler's tick engine for all K sets at once, with the same ready-queue rules (FIFO
+    order for Round Robin, (priority, arrival) for Priority, (period, arrival) for the
+    monotonic policies and (deadline, arrival) for EDF). Only scalar metrics are kept.
+    """
+    def __init__(self, task_sets, sched_types, modes):
+        self.names = list(task_sets[0]) if task_sets else []
+        shape = (len(task_sets), len(self.names))
+
+        def column(attr):
+            return np.array([[getattr(tasks[name], attr) for name in self.names] for tasks in task_sets],
+                            dtype=np.int64).reshape(shape)
+
+        self.period = column('period_ms')
+        self.exec_ms = column('exec_ms')
+        self.priority = column('priority')
+        self.round_robin = np.array([s == SchedulerType.ROUND_ROBIN for s in sched_types], dtype=bool)
+        # Keyed policies leave the running task queued until its job completes
+        self.keyed = np.array([s in (SchedulerType.EDF, SchedulerType.RATE_MONOTONIC,
+                                     SchedulerType.DEADLINE_MONOTONIC) for s in sched_types], dtype=bool)
+        self.edf = np.array([s == SchedulerType.EDF for s in sched_types], dtype=bool)
+        self.preemptive = np.array([m == SchedulingMode.PREEMPTIVE for m in modes], dtype=bool)
+
+    def run(self, duration: int, jobs=None) -> dict:
+        """Simulate every set for `duration` ms; returns arrays of per-set (K) and per-task (K x N) metrics.
+
+        `jobs` (e.g. monte_carlo.JobSampler) gives each release its own execution time and
+        release delay; without it every job takes exec_ms and is released on time. A job's
+        deadline is its nominal release plus the period, so a delayed release neither moves
+        the deadline nor hides a miss.
+        """
+        period, exec_ms = self.period, self.exec_ms
+        k, n = period.shape
+        rows = np.arange(k)
+        time = np.zeros(k, dtype=np.int64)
+        cpu_idle = np.zeros(k, dtype=np.int64)
+        cpu_busy = np.zeros(k, dtype=np.int64)
+
+        next_release = np.zeros((k, n), dtype=np.int64)
+        remaining = exec_ms.copy()
+        released_at = np.zeros((k, n), dtype=np.int64)
+        missed = np.zeros((k, n), dtype=np.int64)
+        deadline = np.full((k, n), _NEVER)
+        jitter_sum = np.zeros((k, n), dtype=np.int64)
+        jitter_count = np.zeros((k, n), dtype=np.int64)
+        max_response = np.zeros((k, n), dtype=np.int64)
+
+        # Ready queue: membership plus an arrival stamp; Round Robin ignores priorities and
+        # EDF ranks by the deadline (next release) set when the job was queued
+        queued = np.zeros((k, n), dtype=bool)
+        arrival = np.zeros((k, n), dtype=np.int64)
+        pushes = np.zeros(k, dtype=np.int64)
+        rank = np.where(self.round_robin[:, None], 0, np.where(self.keyed[:, None], period, self.priority))
+        edf = self.edf[:, None]
+        current = np.full(k, -1)
+        job_exec, delay = jobs.current() if jobs is not None else (exec_ms, 0)
+
+        active = time < duration
+        while n and active.any():
+            # A job still running at its deadline has missed it, whenever the next one is released
+            now = time[:, None]
+            expired = active[:, None] & (now >= deadline)
+            missed += expired & (remaining > 0)
+            deadline = np.where(expired, _NEVER, deadline)
+
+            # Release due tasks, pushing them in task order
+            due = active[:, None] & (now >= next_release + delay)
+            late = due & (next_release > 0)
+            jitter_sum += np.where(late, np.abs(now - next_release - period), 0)
+            jitter_count += late
+            remaining = np.where(due, job_exec, remaining)
+            released_at = np.where(due, now, released_at)
+            # A delayed release does not shift the ones after it
+            next_release = np.where(due, now - delay + period, next_release)
+            deadline = np.where(due & (next_release > 0), next_release, deadline)
+            if jobs is not None:
+                job_exec, delay = jobs.advance(due)
+            rank = np.where(due & edf, next_release, rank)
+            # EDF re-queues a task under its new deadline even if the old job is still queued
+            push = due & (~queued | edf)
+            arrival = np.where(push, pushes[:, None] + np.cumsum(push, axis=1), arrival)
+            pushes += push.sum(axis=1)
+            queued |= push
+
+            # Handle task completion
+            finished = (current >= 0) & (remaining[rows, np.maximum(current, 0)] <= 0)
+            dequeue = finished & self.keyed
+            queued[rows[dequeue], current[dequeue]] = False
+            current = np.where(finished, -1, current)
+
+            empty = active & ~queued.any(axis=1)
+            running = active & ~empty
+
+            # Pop the lowest rank, then earliest arrival, where a new task is picked
+            select = running & (self.preemptive | (current < 0))
+            best = np.where(queued, rank, _NEVER).min(axis=1)
+            pick = np.where(queued & (rank == best[:, None]), arrival, _NEVER).argmin(axis=1)
+            popped = select & ~self.keyed
+            queued[rows[popped], pick[popped]] = False
+            current = np.where(select, pick, current)
+            # For RR, put back at the end if not finished
+            repush = select & self.round_robin & (remaining[rows, pick] > 1)
+            pushes += repush
+            arrival[rows[repush], pick[repush]] = pushes[repush]
+            queued[rows[repush], pick[repush]] = True
+
+            # Execute current task
+            r, c = rows[running], current[running]
+            exec_slice = np.minimum(1, remaining[r, c])
+            remaining[r, c] -= exec_slice
+            end = time[running] + exec_slice
+            done = (exec_slice > 0) & (remaining[r, c] == 0) & (period[r, c] > 0)
+            np.maximum.at(max_response, (r[done], c[done]), end[done] - released_at[r[done], c[done]])
+            cpu_busy[running] += exec_slice
+            time[running] = end
+
+            cpu_idle += empty
+            time += empty
+            active = time < duration
+
+        if not n:
+            cpu_idle += max(duration, 0)
+        total = cpu_idle + cpu_busy
+        return {
+            'cpu_idle': cpu_idle,
+            'cpu_busy': cpu_busy,
+            'cpu_load': np.divide(cpu_busy, total, out=np.zeros(k), where=total > 0),
+            'deadlines_missed': missed.sum(axis=1),
+            'task_missed': missed,
+            'avg_jitter': np.divide(jitter_sum, jitter_count, out=np.zeros((k, n)), where=jitter_count > 0),
+            'max_response': max_response,
+        }
@@ -1,92 +1,355 @@
 import csv
-import matplotlib.pyplot as plt
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from io import BytesIO, StringIO
-import pandas as pd
-from scheduler_sim import Scheduler, SchedulerType, SchedulingMode, Task
+from scheduler_sim import Scheduler, SchedulerType, SchedulingMode
+from task_table import TaskTable
+from sim_trace import gantt_columns
+from schedulability import Verdict, analyze, analyze_edf, busy_time
+from batch_sim import LockstepBatch
+from result_cache import cached_run
+
+def build_variation(base_tasks, variation):
+    """Apply one variation dict to the base tasks (a TaskTable or task dict); returns (tasks, sched_type, mode)"""
+    # Apply per-task variations if specified
+    tasks = TaskTable.of(base_tasks).to_tasks(variation.get("tasks"))
+    
+    # Get scheduler type and mode
+    sched_type_str = variation.get("sched_type", "PRIORITY")
+    sched_type = getattr(SchedulerType, sched_type_str.upper(), SchedulerType.PRIORITY)
+    
+    mode_str = variation.get("mode", "PREEMPTIVE")
+    mode = getattr(SchedulingMode, mode_str.upper(), SchedulingMode.PREEMPTIVE)
+    return tasks, sched_type, mode
+
+def summary_entry(config_id, sched_type, mode, summary):
+    """One comparison_data row from a run summary (RunMetrics.summary())"""
+    comp_entry = {
+        "config_id": config_id,
+        "scheduler": sched_type.value,
+        "mode": mode.value,
+        "cpu_load": summary["cpu_load"],
+        "idle_time": summary["cpu_idle"],
+        "busy_time": summary["cpu_busy"],
+        "missed_deadlines": summary["deadlines_missed"]
+    }
+    
+    # Add task-specific metrics
+    for name, stats in summary["tasks"].items():
+        comp_entry[f"{name}_jitter"] = stats["avg_jitter"]
+        comp_entry[f"{name}_missed"] = stats["deadlines_missed"]
+    return comp_entry
+
+def gantt_dataframe(gantt):
+    """DataFrame (task, start, end) built on the trace columns without per-interval tuples"""
+    import pandas as pd
+    names, task_ids, starts, ends = gantt_columns(gantt)
+    return pd.DataFrame({
+        "task": pd.Categorical.from_codes(task_ids, categories=names),
+        "start": starts,
+        "end": ends
+    }, copy=False)
+
+# Preemptive policies the analysis models exactly, so its verdict can stand in for a run
+SETTLED_BY_ANALYSIS = (SchedulerType.EDF, SchedulerType.RATE_MONOTONIC, SchedulerType.DEADLINE_MONOTONIC)
+
+def analytic_columns(report, tasks, sim_max_response=None):
+    """Analysis columns for a comparison row, next to the simulated worst response times"""
+    columns = {
+        "analytic_verdict": report.verdict.value,
+        "utilization": report.utilization,
+        "simulated": sim_max_response is not None
+    }
+    for name in tasks:
+        columns[f"{name}_wcrt"] = report.wcrt.get(name)
+        columns[f"{name}_sim_max_response"] = sim_max_response[name] if sim_max_response else None
+    return columns
+
+def analytic_entry(config_id, sched_type, mode, tasks, report, duration):
+    """Comparison row for a variation settled by analysis alone.
+    
+    Releases do not depend on the policy, so jitter is exact. A schedulable set runs every
+    job to completion without idling while work is pending, which fixes the busy time and
+    leaves nothing missed; how much an overloaded set misses is left unknown (None).
+    """
+    schedulable = report.verdict == Verdict.SCHEDULABLE
+    busy = busy_time(tasks, duration) if schedulable else None
+    comp_entry = {
+        "config_id": config_id,
+        "scheduler": sched_type.value,
+        "mode": mode.value,
+        "cpu_load": (busy / duration if duration else 0) if schedulable else None,
+        "idle_time": duration - busy if schedulable else None,
+        "busy_time": busy,
+        "missed_deadlines": 0 if schedulable else None
+    }
+    for name, task in tasks.items():
+        # Every release after the first is on time and records one period of jitter
+        comp_entry[f"{name}_jitter"] = float(task.period_ms) if task.period_ms < duration else 0.0
+        comp_entry[f"{name}_missed"] = 0 if schedulable else None
+    comp_entry.update(analytic_columns(report, tasks))
+    return comp_entry
+
+def settled_by_analysis(sched_type, report, precheck) -> bool:
+    """True when precheck="skip" can leave this variation out of the simulation"""
+    return (precheck == "skip" and report is not None and sched_type in SETTLED_BY_ANALYSIS
+            and report.verdict != Verdict.UNSCHEDULABLE)
+
+def run_variation(config_id, base_tasks, variation, duration, precheck=None, cache=None):
+    """Run one variation; returns (scheduler, report, comparison row).
+    
+    precheck="flag" adds the analytic verdict and worst-case response times to preemptive
+    rows (see precheck_report). precheck="skip" also leaves out the simulation of EDF and
+    Rate/Deadline Monotonic variations proven schedulable or overloaded (scheduler is then
+    None, see analytic_entry); Priority rows are only flagged.
+    With a ResultCache, a configuration simulated before is not run again; the scheduler is
+    restored from the cache, or None if the cache keeps summaries only.
+    """
+    tasks, sched_type, mode = build_variation(base_tasks, variation)
+    report = precheck_report(tasks, sched_type, mode, precheck)
+    if settled_by_analysis(sched_type, report, precheck):
+        return None, report, analytic_entry(config_id, sched_type, mode, tasks, report, duration)
+    
+    if cache is None:
+        scheduler = Scheduler(tasks)
+        scheduler.run(duration, sched_type, mode)
+        summary = scheduler.run_metrics.summary(include_response=report is not None)
+    else:
+        scheduler, summary = cached_run(cache, tasks, sched_type, mode, duration)
+    comp_entry = summary_entry(config_id, sched_type, mode, summary)
+    if report:
+        max_response = {name: stats['max_response'] for name, stats in summary['tasks'].items()}
+        comp_entry.update(analytic_columns(report, tasks, max_response))
+    return scheduler, report, comp_entry
+
+def precheck_report(tasks, sched_type, mode, precheck):
+    """Schedulability report for a preemptive variation when precheck is on.
+    
+    EDF gets the exact U <= 1 test and Rate/Deadline Monotonic response-time analysis with
+    the period as priority (deadlines equal periods); both match the simulated policies.
+    Priority is analysed on its priority field, but Scheduler's Priority loop does not
+    re-queue a popped task as the analysis assumes, so its verdict can disagree with the
+    simulation and is only reported beside it. Cooperative runs get no report.
+    """
+    if precheck not in (None, "flag", "skip"):
+        raise ValueError(f"Unknown precheck {precheck!r}, expected None, 'flag' or 'skip'")
+    if not precheck or mode != SchedulingMode.PREEMPTIVE or sched_type == SchedulerType.ROUND_ROBIN:
+        return None
+    try:
+        if sched_type == SchedulerType.EDF:
+            return analyze_edf(tasks)
+        if sched_type in SETTLED_BY_ANALYSIS:
+            tasks = {name: {"period_ms": task.period_ms, "exec_ms": task.exec_ms, "priority": task.period_ms}
+                     for name, task in tasks.items()}
+        return analyze(tasks)
+    except ValueError:
+        return None  # Non-positive periods: nothing to prove, just simulate
+
+def run_lockstep(base_tasks, variations, duration, precheck=None):
+    """Yield (summary, comparison row) per variation, simulating all of them in one LockstepBatch.
+    
+    Rows match run_variation's; variations settled by precheck="skip" are left out of the batch.
+    """
+    base_tasks = TaskTable.of(base_tasks)
+    configs = [build_variation(base_tasks, variation) for variation in variations]
+    reports = [precheck_report(tasks, sched_type, mode, precheck) for tasks, sched_type, mode in configs]
+    simulated = [i for i, ((_, sched_type, _), report) in enumerate(zip(configs, reports))
+                 if not settled_by_analysis(sched_type, report, precheck)]
+    batch = LockstepBatch(*zip(*[configs[i] for i in simulated])) if simulated else None
+    results = batch.run(duration) if batch else None
+    row = {i: r for r, i in enumerate(simulated)}
+    
+    for i, (tasks, sched_type, mode) in enumerate(configs):
+        report = reports[i]
+        if i not in row:
+            comp_entry = analytic_entry(i, sched_type, mode, tasks, report, duration)
+        else:
+            r = row[i]
+            comp_entry = {
+                "config_id": i,
+                "scheduler": sched_type.value,
+                "mode": mode.value,
+                "cpu_load": float(results["cpu_load"][r]),
+                "idle_time": int(results["cpu_idle"][r]),
+                "busy_time": int(results["cpu_busy"][r]),
+                "missed_deadlines": int(results["deadlines_missed"][r])
+            }
+            for j, name in enumerate(batch.names):
+                comp_entry[f"{name}_jitter"] = float(results["avg_jitter"][r, j])
+                comp_entry[f"{name}_missed"] = int(results["task_missed"][r, j])
+            if report:
+                max_response = {name: int(results["max_response"][r, j]) for j, name in enumerate(batch.names)}
+                comp_entry.update(analytic_columns(report, tasks, max_response))
+        
+        summary = {
+            "cpu_load": comp_entry["cpu_load"],
+            "cpu_idle": comp_entry["idle_time"],
+            "cpu_busy": comp_entry["busy_time"],
+            "deadlines_missed": comp_entry["missed_deadlines"]
+        }
+        if report:
+            summary["analysis"] = report
+        yield summary, comp_entry
+
+def _simulate_summary(job):
+    """Process-pool worker: run one variation and return only picklable data"""
+    config_id, base_tasks, variation, duration, keep_trace, trace_path, precheck = job
+    scheduler, report, comp_entry = run_variation(config_id, base_tasks, variation, duration, precheck)
+    summary = {
+        "cpu_load": comp_entry["cpu_load"],
+        "cpu_idle": comp_entry["idle_time"],
+        "cpu_busy": comp_entry["busy_time"],
+        "deadlines_missed": comp_entry["missed_deadlines"]
+    }
+    if report:
+        summary["analysis"] = report
+    gantt = None
+    if scheduler:
+        if trace_path:
+            scheduler.export_csv(trace_path)
+        gantt = scheduler.gantt_log
+    kept = {"id": config_id, "variation": variation, "metrics": summary, "gantt": gantt} if keep_trace else None
+    return summary, comp_entry, kept
+
+def _simulate_chunk(jobs):
+    return [_simulate_summary(job) for job in jobs]
+
+def _iter_parallel(jobs, workers, chunksize):
+    """Yield worker results in job order, with only a few chunks in flight at any time"""
+    window = 2 * (workers or os.cpu_count() or 1)
+    jobs = iter(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        while True:
+            chunk = list(islice(jobs, chunksize))
+            if chunk:
+                pending.append(executor.submit(_simulate_chunk, chunk))
+            if pending and (not chunk or len(pending) >= window):
+                yield from pending.popleft().result()
+            elif not chunk:
+                return
 
 class BenchmarkSimulator:
     def __init__(self):
         self.results = []
         self.comparison_data = []
     
-    def run_batch(self, base_tasks, variations, duration=100):
-        """Run batch simulations with varying parameters"""
+    def run_batch(self, base_tasks, variations, duration=100, workers=1, chunksize=1, precheck=None,
+                  lockstep=False, cache=None):
+        """Run batch simulations with varying parameters.
+        
+        With workers above 1 the variations are spread over a process pool (None uses every
+        core); 0 and 1 run serially. Parallel results hold scalar metrics only, no Scheduler or gantt objects.
+        lockstep=True instead simulates all variations together in NumPy (see batch_sim), also
+        with scalar results only. precheck ("flag" or "skip") adds the analytic schedulability
+        check, see run_variation. A ResultCache is only consulted on the serial path.
+        """
         self.results = []
         self.comparison_data = []
+        base_tasks = TaskTable.of(base_tasks)
+        
+        if lockstep:
+            variations = list(variations)
+            for (i, variation), (summary, comp_entry) in zip(
+                    enumerate(variations), run_lockstep(base_tasks, variations, duration, precheck)):
+                self.results.append({"id": i, "variation": variation, "metrics": summary})
+                self.comparison_data.append(comp_entry)
+            return self.results
+        
+        if workers not in (0, 1):
+            # The variations are walked twice below, once to build the jobs and once to label rows
+            variations = list(variations)
+            jobs = ((i, base_tasks, variation, duration, False, None, precheck)
+                    for i, variation in enumerate(variations))
+            for (i, variation), (summary, comp_entry, _) in zip(
+                    enumerate(variations), _iter_parallel(jobs, workers, chunksize)):
+                self.results.append({"id": i, "variation": variation, "metrics": summary})
+                self.comparison_data.append(comp_entry)
+            return self.results
         
         for i, variation in enumerate(variations):
-            # Create modified task set
-            tasks = {}
-            for name, params in base_tasks.items():
-                modified_params = params.copy()
-                
-                # Apply variation if specified
-                if "tasks" in variation and name in variation["tasks"]:
-                    for param, value in variation["tasks"][name].items():
-                        modified_params[param] = value
-                
-                tasks[name] = Task(
-                    name=name,
-                    period_ms=modified_params["period_ms"],
-                    exec_ms=modified_params["exec_ms"],
-                    priority=modified_params["priority"]
-                )
-            
-            # Get scheduler type and mode
-            sched_type_str = variation.get("sched_type", "PRIORITY")
-            sched_type = getattr(SchedulerType, sched_type_str.upper(), SchedulerType.PRIORITY)
-            
-            mode_str = variation.get("mode", "PREEMPTIVE")
-            mode = getattr(SchedulingMode, mode_str.upper(), SchedulingMode.PREEMPTIVE)
-            
-            # Create and run scheduler
-            scheduler = Scheduler(tasks)
-            gantt, metrics = scheduler.run(duration, sched_type, mode)
+            scheduler, report, comp_entry = run_variation(i, base_tasks, variation, duration, precheck, cache)
             
             # Collect results
             result = {
                 "id": i,
                 "variation": variation,
                 "scheduler": scheduler,
-                "metrics": metrics,
-                "gantt": gantt
+                "metrics": scheduler.metrics if scheduler else None,
+                "gantt": scheduler.gantt_log if scheduler else None
             }
-            
-            # Collect comparison data
-            comp_entry = {
-                "config_id": i,
-                "scheduler": sched_type.value,
-                "mode": mode.value,
-                "cpu_load": metrics["cpu_load"],
-                "idle_time": metrics["cpu_idle"],
-                "busy_time": metrics["cpu_busy"],
-                "missed_deadlines": metrics["deadlines_missed"]
-            }
-            
-            # Add task-specific metrics
-            for name, task in tasks.items():
-                jitter_list = metrics["task_jitter"][name]
-                avg_jitter = sum(jitter_list)/len(jitter_list) if jitter_list else 0
-                comp_entry[f"{name}_jitter"] = avg_jitter
-                comp_entry[f"{name}_missed"] = task.deadline_missed
+            if report:
+                result["analysis"] = report
             
             self.results.append(result)
             self.comparison_data.append(comp_entry)
         
         return self.results
     
+    def iter_batch(self, base_tasks, variations, duration=100, keep_traces=(), trace_dir=None,
+                   workers=1, chunksize=1, precheck=None, cache=None):
+        """Yield one comparison row per variation as it completes, without accumulating runs.
+        
+        Only config ids in keep_traces are stored in self.results (with their gantt); with
+        trace_dir every run's trace is written to trace_dir/config_<id>.csv instead of kept.
+        comparison_data is left untouched so memory stays flat for any number of variations.
+        workers is handled as in run_batch, and a ResultCache is only used when running serially.
+        """
+        self.results = []
+        keep_traces = set(keep_traces)
+        base_tasks = TaskTable.of(base_tasks)
+        
+        def trace_path(i):
+            return os.path.join(trace_dir, f"config_{i}.csv") if trace_dir else None
+        
+        if workers not in (0, 1):
+            jobs = ((i, base_tasks, variation, duration, i in keep_traces, trace_path(i), precheck)
+                    for i, variation in enumerate(variations))
+            for _, comp_entry, kept in _iter_parallel(jobs, workers, chunksize):
+                if kept is not None:
+                    self.results.append(kept)
+                yield comp_entry
+            return
+        
+        for i, variation in enumerate(variations):
+            scheduler, report, comp_entry = run_variation(i, base_tasks, variation, duration, precheck, cache)
+            if scheduler and trace_dir:
+                scheduler.export_csv(trace_path(i))
+            if i in keep_traces:
+                self.results.append({
+                    "id": i,
+                    "variation": variation,
+                    "scheduler": scheduler,
+                    "metrics": scheduler.metrics if scheduler else None,
+                    "gantt": scheduler.gantt_log if scheduler else None
+                })
+            yield comp_entry
+    
+    def gantt_frame(self, config_id):
+        """Gantt trace of a stored run as a DataFrame, or None if it was not kept"""
+        for result in self.results:
+            if result["id"] == config_id and "gantt" in result:
+                return gantt_dataframe(result["gantt"])
+        return None
+    
     def plot_comparison(self, figsize=(12, 8), dpi=100):
         """Create comparison plots with better layout"""
         if not self.comparison_data:
             return None
         
+        # Plotting and pandas are imported on first use so headless batch runs start fast
+        import matplotlib.pyplot as plt
+        
         # Create figure with proper spacing
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=figsize, dpi=dpi)
         fig.subplots_adjust(hspace=0.4)  # Add space between subplots
         
-        # CPU Load plot
-        config_ids = [f"Config {i}" for i in range(len(self.comparison_data))]
-        cpu_loads = [d['cpu_load'] for d in self.comparison_data]
+        # CPU Load plot (configurations a sweep pruned have no metrics)
+        rows = [d for d in self.comparison_data if d['cpu_load'] is not None]
+        config_ids = [f"Config {d['config_id']}" for d in rows]
+        cpu_loads = [d['cpu_load'] for d in rows]
         ax1.bar(config_ids, cpu_loads, color='skyblue')
         ax1.set_title("CPU Utilization Comparison", fontsize=14)
         ax1.set_ylabel("CPU Load", fontsize=12)
@@ -99,7 +362,7 @@ class BenchmarkSimulator:
             ax1.text(i, v + 0.02, f"{v:.1%}", ha='center', fontsize=10)
         
         # Missed deadlines plot
-        deadlines = [d['missed_deadlines'] for d in self.comparison_data]
+        deadlines = [d['missed_deadlines'] or 0 for d in rows]
         ax2.bar(config_ids, deadlines, color='lightcoral')
         ax2.set_title("Missed Deadlines Comparison", fontsize=14)
         ax2.set_ylabel("Count", fontsize=12)
@@ -123,6 +386,7 @@ class BenchmarkSimulator:
         if not self.comparison_data:
             return False
         
+        import pandas as pd
         df = pd.DataFrame(self.comparison_data)
         df.to_csv(filename, index=False)
         return True
@@ -132,6 +396,7 @@ class BenchmarkSimulator:
         if not self.comparison_data:
             return ""
         
+        import pandas as pd
         df = pd.DataFrame(self.comparison_data)
         return df.to_string(index=False)
     
@@ -148,7 +413,8 @@ class BenchmarkSimulator:
         md += "| Config | Scheduler | Mode | CPU Load | Missed Deadlines |\n"
         md += "|--------|-----------|------|----------|------------------|\n"
         
-        for config in self.comparison_data:
+        simulated = [c for c in self.comparison_data if c['cpu_load'] is not None]
+        for config in simulated:
             md += f"| {config['config_id']} | {config['scheduler']} | {config['mode']} "
             md += f"| {config['cpu_load']:.2%} | {config['missed_deadlines']} |\n"
         
@@ -159,8 +425,8 @@ class BenchmarkSimulator:
         md += "- Jitter is minimized with proper priority assignment\n\n"
         
         # Add statistics
-        avg_load = sum(c['cpu_load'] for c in self.comparison_data)/len(self.comparison_data)
-        total_missed = sum(c['missed_deadlines'] for c in self.comparison_data)
+        avg_load = sum(c['cpu_load'] for c in simulated)/max(len(simulated), 1)
+        total_missed = sum(c['missed_deadlines'] or 0 for c in simulated)
         md += f"**Average CPU Load:** {avg_load:.2%}\n\n"
         md += f"**Total Missed Deadlines:** {total_missed}\n\n"
         
@@ -0,0 +1,176 @@
+"""Design-space sweeps: generate variations from a grid or random samples, skip equivalent
+and dominated configurations, and stream one comparison row per point.
+
+A sweep spec is plain data (JSON or a Python literal), e.g.
+    {"grid": {"Task1": {"exec_ms": [1, 2, 3]}, "Task2": {"priority": [0, 1, 2]}},
+     "sched_type": ["PRIORITY", "ROUND_ROBIN"], "mode": ["PREEMPTIVE"]}
+or, for random sampling, "random": {task: {param: [low, high]}} with "samples" and "seed".
+"""
+import itertools
+import random
+from benchmark_simulator import build_variation, run_lockstep, run_variation
+from scheduler_sim import SchedulerType, SchedulingMode
+from task_table import TaskTable
+
+PARAMS = ("period_ms", "exec_ms", "priority")
+
+def grid_variations(task_values, sched_types=("PRIORITY",), modes=("PREEMPTIVE",)):
+    """Every combination of {task: {param: [values]}} with every policy and mode.
+
+    exec_ms values are visited in ascending order, so a configuration always comes after
+    the ones it dominates (same everything, no larger execution times).
+    """
+    axes = [(name, param, sorted(values) if param == "exec_ms" else list(values))
+            for name, params in task_values.items() for param, values in params.items()]
+    for sched_type, mode in itertools.product(sched_types, modes):
+        for point in itertools.product(*(values for _, _, values in axes)):
+            tasks = {}
+            for (name, param, _), value in zip(axes, point):
+                tasks.setdefault(name, {})[param] = value
+            yield {"sched_type": sched_type, "mode": mode, "tasks": tasks}
+
+def random_variations(task_ranges, samples: int, sched_types=("PRIORITY",), modes=("PREEMPTIVE",),
+                      seed: int = 0):
+    """`samples` variations with each {task: {param: [low, high]}} drawn uniformly (inclusive)"""
+    rng = random.Random(seed)
+    for _ in range(samples):
+        tasks = {name: {param: rng.randint(low, high) for param, (low, high) in params.items()}
+                 for name, params in task_ranges.items()}
+        yield {"sched_type": rng.choice(sched_types), "mode": rng.choice(modes), "tasks": tasks}
+
+def spec_variations(spec):
+    """Variations described by a sweep spec (see the module docstring)"""
+    sched_types = spec.get("sched_type", ["PRIORITY"])
+    modes = spec.get("mode", ["PREEMPTIVE"])
+    if "random" in spec:
+        return random_variations(spec["random"], spec.get("samples", 100), sched_types, modes,
+                                 spec.get("seed", 0))
+    return grid_variations(spec.get("grid", {}), sched_types, modes)
+
+def canonical_config(tasks, sched_type, mode):
+    """Hashable form under which equivalent configurations coincide.
+
+    Only the order of priorities matters (ties stay FIFO), so they are replaced by their
+    dense rank; the other policies ignore them altogether.
+    """
+    if sched_type == SchedulerType.PRIORITY:
+        ranks = {p: r for r, p in enumerate(sorted({task.priority for task in tasks.values()}))}
+    else:
+        ranks = {task.priority: 0 for task in tasks.values()}
+    return (sched_type, mode,
+            tuple((name, task.period_ms, task.exec_ms, ranks[task.priority]) for name, task in tasks.items()))
+
+class _Dominance:
+    """Minimal failing exec_ms vectors per group of otherwise identical configurations"""
+    def __init__(self):
+        self.failures = {}
+
+    @staticmethod
+    def split(canonical):
+        sched_type, mode, tasks = canonical
+        group = (sched_type, mode, tuple((name, period, rank) for name, period, _, rank in tasks))
+        return group, tuple(exec_ms for _, _, exec_ms, _ in tasks)
+
+    def dominated_by(self, canonical):
+        group, execs = self.split(canonical)
+        for failed, config_id in self.failures.get(group, ()):
+            if all(e >= f for e, f in zip(execs, failed)):
+                return config_id
+        return None
+
+    def add_failure(self, canonical, config_id):
+        group, execs = self.split(canonical)
+        kept = [(failed, i) for failed, i in self.failures.get(group, [])
+                if not all(f >= e for f, e in zip(failed, execs))]
+        kept.append((execs, config_id))
+        self.failures[group] = kept
+
+def _param_columns(tasks):
+    return {f"{name}_{param}": getattr(task, param) for name, task in tasks.items() for param in PARAMS}
+
+def _pruned_entry(config_id, tasks, sched_type, mode, dominated_by):
+    """Row for a configuration that was not simulated since a dominated one already misses deadlines"""
+    comp_entry = {
+        "config_id": config_id,
+        "scheduler": sched_type.value,
+        "mode": mode.value,
+        "cpu_load": None,
+        "idle_time": None,
+        "busy_time": None,
+        "missed_deadlines": None
+    }
+    for name in tasks:
+        comp_entry[f"{name}_jitter"] = None
+        comp_entry[f"{name}_missed"] = None
+    comp_entry["dominated_by"] = dominated_by
+    return comp_entry
+
+def sweep(base_tasks, variations, duration: int = 200, dedup: bool = True, prune: bool = True,
+          batch_size: int = 1, precheck=None, cache=None):
+    """Yield a comparison row per variation, in order, without keeping the runs.
+
+    Rows carry each task's period_ms/exec_ms/priority columns. With dedup, a configuration
+    equivalent to an earlier one reuses its row ("duplicate_of"). With prune, one whose
+    execution times are all >= those of a configuration that already missed deadlines is
+    not simulated ("dominated_by", metrics None). Pruning applies to preemptive runs only:
+    without preemption a longer job can reorder the schedule so that fewer deadlines are
+    missed (a scheduling anomaly), so cooperative runs are always simulated.
+    batch_size > 1 simulates that many configurations at a time with the lockstep engine,
+    and pruning then only uses results of earlier batches. cache is passed to run_variation.
+    """
+    base_tasks = TaskTable.of(base_tasks)
+    seen = {}
+    dominance = _Dominance()
+    order = []     # (config id, tasks, run key, row if already known)
+    to_run = {}    # run key -> (config id, variation, canonical form)
+
+    def flush():
+        if batch_size > 1:
+            results = (entry for _, entry in run_lockstep(base_tasks, [v for _, v, _ in to_run.values()],
+                                                          duration, precheck))
+        else:
+            results = (run_variation(i, base_tasks, v, duration, precheck, cache)[2]
+                       for i, v, _ in to_run.values())
+        for (key, (i, _, canonical)), comp_entry in zip(to_run.items(), results):
+            comp_entry["config_id"] = i
+            seen[key] = comp_entry
+            if prune and canonical[1] == SchedulingMode.PREEMPTIVE and comp_entry["missed_deadlines"]:
+                dominance.add_failure(canonical, i)
+        to_run.clear()
+
+        for i, tasks, key, comp_entry in order:
+            if comp_entry is None:
+                comp_entry = seen[key]
+                if comp_entry["config_id"] != i:
+                    comp_entry = dict(comp_entry, config_id=i, duplicate_of=comp_entry["config_id"])
+            comp_entry.update(_param_columns(tasks))
+            yield comp_entry
+        order.clear()
+
+    for i, variation in enumerate(variations):
+        tasks, sched_type, mode = build_variation(base_tasks, variation)
+        canonical = canonical_config(tasks, sched_type, mode)
+        key = canonical if dedup else i
+        if key not in seen and key not in to_run:
+            # A configuration already simulated keeps its row even if it is now dominated
+            dominated_by = dominance.dominated_by(canonical) if prune and mode == SchedulingMode.PREEMPTIVE else None
+            if dominated_by is not None:
+                order.append((i, tasks, key, _pruned_entry(i, tasks, sched_type, mode, dominated_by)))
+                continue
+            to_run[key] = (i, variation, canonical)
+        order.append((i, tasks, key, None))
+        if len(to_run) >= batch_size:
+            yield from flush()
+    yield from flush()
+
+def sweep_columns(task_names, precheck=None):
+    """Every column a sweep row can have, for writing rows as they stream"""
+    columns = ["config_id", "scheduler", "mode", "cpu_load", "idle_time", "busy_time", "missed_deadlines"]
+    for name in task_names:
+        columns += [f"{name}_jitter", f"{name}_missed"]
+    if precheck:
+        columns += ["analytic_verdict", "utilization", "simulated"]
+        for name in task_names:
+            columns += [f"{name}_wcrt", f"{name}_sim_max_response"]
+    columns += [f"{name}_{param}" for name in task_names for param in PARAMS]
+    return columns + ["duplicate_of", "dominated_by"]
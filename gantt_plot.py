@@ -0,0 +1,96 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
+from sim_trace import gantt_columns
+
+def merged_intervals(starts, ends):
+    """Drop empty intervals and join touching ones; the input is in time order"""
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    first = np.ones(len(starts), dtype=bool)
+    first[1:] = starts[1:] != ends[:-1]
+    heads = np.flatnonzero(first)
+    tails = np.append(heads[1:], len(starts))[:len(heads)] - 1
+    return starts[heads], ends[tails]
+
+def _task_rows(gantt):
+    """Sorted task names and the merged (starts, ends) of each"""
+    names, task_ids, starts, ends = gantt_columns(gantt)
+    tasks = sorted(names)
+    rows = [merged_intervals(starts[task_ids == names.index(task)], ends[task_ids == names.index(task)])
+            for task in tasks]
+    return tasks, rows
+
+def _format_axes(ax, tasks, max_time, title):
+    ax.set_yticks(list(range(len(tasks))))
+    ax.set_yticklabels(tasks, fontsize=10)
+    ax.set_xlabel('Time (ms)', fontsize=12)
+    ax.set_title(title, fontsize=14)
+    ax.grid(True, axis='x', linestyle='--', alpha=0.7)
+    ax.set_xlim(0, max_time)
+    ax.tick_params(axis='x', labelsize=10)
+
+def draw_gantt(ax, gantt, max_time, title='Task Execution Timeline'):
+    """Draw a gantt trace with one broken_barh collection per task row (sorted by name)"""
+    tasks, rows = _task_rows(gantt)
+    colors = plt.cm.tab10.colors
+    for row, (task, (starts, ends)) in enumerate(zip(tasks, rows)):
+        ax.broken_barh(np.column_stack((starts, ends - starts)), (row - 0.3, 0.6),
+                       facecolors=colors[row % len(colors)], label=task)
+    _format_axes(ax, tasks, max_time, title)
+
+class GanttViewport:
+    """Gantt chart that only draws the visible time window, at most one bar per pixel.
+    
+    Redrawn whenever the x range changes (toolbar zoom/pan or set_xlim). Rows with more
+    intervals in view than the axes has pixels are shown as per-pixel occupancy bins,
+    shaded by the fraction of the bin the task was running. Keep a reference to the
+    viewport: matplotlib only holds its callback weakly.
+    """
+    def __init__(self, ax, gantt, max_time, title='Task Execution Timeline'):
+        self.ax = ax
+        self.tasks, self.rows = _task_rows(gantt)
+        # Running CPU time at the start of each interval, for occupancy queries
+        self._busy = [np.concatenate(([0], np.cumsum(ends - starts))) for starts, ends in self.rows]
+        self._artists = []
+        _format_axes(ax, self.tasks, max_time, title)
+        self.redraw()
+        ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+    def _on_xlim_changed(self, ax):
+        self.redraw()
+
+    def _busy_before(self, row: int, times):
+        starts, ends = self.rows[row]
+        if not len(starts):
+            return np.zeros(len(times))
+        idx = np.searchsorted(starts, times, side='right') - 1
+        clipped = np.maximum(idx, 0)
+        inside = np.clip(times - starts[clipped], 0, ends[clipped] - starts[clipped])
+        return np.where(idx >= 0, self._busy[row][clipped] + inside, 0)
+
+    def redraw(self):
+        for artist in self._artists:
+            artist.remove()
+        self._artists = []
+        
+        low, high = self.ax.get_xlim()
+        pixels = max(int(self.ax.bbox.width), 1)
+        edges = np.linspace(low, high, pixels + 1)
+        colors = plt.cm.tab10.colors
+        for row, (task, (starts, ends)) in enumerate(zip(self.tasks, self.rows)):
+            color = colors[row % len(colors)]
+            first = np.searchsorted(ends, low, side='right')
+            last = np.searchsorted(starts, high, side='left')
+            if last - first <= pixels:
+                xranges = np.column_stack((starts[first:last], ends[first:last] - starts[first:last]))
+                facecolors = color
+            else:
+                # Too dense to see single intervals: one bar per pixel, alpha = share of the bin
+                busy = np.diff(self._busy_before(row, edges)) / np.diff(edges)
+                used = np.flatnonzero(busy > 0)
+                xranges = np.column_stack((edges[used], np.diff(edges)[used]))
+                facecolors = [to_rgba(color, 0.25 + 0.75 * min(share, 1)) for share in busy[used]]
+            self._artists.append(self.ax.broken_barh(xranges, (row - 0.3, 0.6), facecolors=facecolors,
+                                                     label=task))
+        self.ax.figure.canvas.draw_idle()
@@ -0,0 +1,206 @@
+"""Monte Carlo runs with stochastic execution times and release jitter.
+
+Each replication is one row of a LockstepBatch, so a batch of replications costs about as
+much as a single NumPy simulation. Every job draws its execution time (and release delay)
+from the task's distribution when the previous job is released. Release jitter delays a
+job but not its deadline, which stays one period after the nominal release.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Dict, Optional, Sequence
+import numpy as np
+from batch_sim import LockstepBatch
+
+@dataclass
+class Uniform:
+    """Integer milliseconds uniform on [low, high]"""
+    low: int
+    high: int
+
+    def sample(self, rng, size):
+        return rng.integers(self.low, self.high + 1, size)
+
+@dataclass
+class TruncatedNormal:
+    """Normal(mean, std) rounded to milliseconds and restricted to [low, high].
+
+    Each millisecond value k in [low, high] is drawn with the normal's mass on
+    [k - 0.5, k + 0.5], so the distribution is that of redrawing until the rounded value
+    falls in range, without a loop that stalls when the range is far in a tail.
+    """
+    mean: float
+    std: float
+    low: int
+    high: int
+
+    def __post_init__(self):
+        if self.low > self.high:
+            raise ValueError(f"TruncatedNormal needs low <= high, got [{self.low}, {self.high}]")
+        values = np.arange(self.low, self.high + 1, dtype=np.int64)
+        if self.std > 0:
+            weights = np.array([self._mass(k - 0.5, k + 0.5) for k in values])
+        else:
+            weights = (values == np.rint(self.mean)).astype(float)
+        if not weights.sum() > 0:
+            raise ValueError(f"Normal({self.mean}, {self.std}) has no probability mass in "
+                             f"[{self.low}, {self.high}]")
+        self._values = values
+        self._p = weights / weights.sum()
+
+    def _mass(self, a, b):
+        """P(a < X < b), taken from the nearer tail so it stays accurate far from the mean"""
+        scale = self.std * math.sqrt(2)
+        za, zb = (a - self.mean) / scale, (b - self.mean) / scale
+        if za > 0:
+            return 0.5 * (math.erfc(za) - math.erfc(zb))
+        return 0.5 * (math.erfc(-zb) - math.erfc(-za))
+
+    def sample(self, rng, size):
+        return rng.choice(self._values, size, p=self._p)
+
+@dataclass
+class Empirical:
+    """Observed values (e.g. a histogram's bins), optionally weighted by their counts"""
+    values: Sequence[int]
+    weights: Optional[Sequence[float]] = None
+
+    def sample(self, rng, size):
+        p = None
+        if self.weights is not None:
+            p = np.asarray(self.weights, dtype=float)
+            p = p / p.sum()
+        return rng.choice(np.asarray(self.values, dtype=np.int64), size, p=p)
+
+def distribution_from_spec(spec):
+    """Distribution from plain data: an int, {"uniform": [low, high]},
+    {"normal": [mean, std, low, high]} or {"empirical": {"values": [...], "weights": [...]}}"""
+    if isinstance(spec, int):
+        return Uniform(spec, spec)
+    (kind, args), = spec.items()
+    if kind == "uniform":
+        return Uniform(*args)
+    if kind == "normal":
+        return TruncatedNormal(*args)
+    if kind == "empirical":
+        return Empirical(args["values"], args.get("weights"))
+    raise ValueError(f"Unknown distribution: {kind}")
+
+class JobSampler:
+    """Execution time and release delay of each task's next job, drawn as jobs are released.
+
+    Only the replications x tasks values of the pending jobs are held, so memory does not
+    grow with the duration; advance() redraws them for the tasks just released.
+    """
+    def __init__(self, tasks, replications: int, rng, exec_dist=None, release_jitter=None):
+        exec_dist = exec_dist or {}
+        release_jitter = release_jitter or {}
+        self.rng = rng
+        # (column, exec distribution, delay distribution) of the tasks with any randomness
+        self.random_tasks = [(j, exec_dist.get(name), release_jitter.get(name))
+                             for j, name in enumerate(tasks)
+                             if name in exec_dist or name in release_jitter]
+        self.exec = np.tile(np.array([task.exec_ms for task in tasks.values()], dtype=np.int64),
+                            (replications, 1))
+        self.delay = np.zeros((replications, len(tasks)), dtype=np.int64)
+        self._draw(np.ones(self.exec.shape, dtype=bool))
+
+    def _draw(self, released):
+        for j, exec_dist, jitter in self.random_tasks:
+            rows = released[:, j]
+            count = int(rows.sum())
+            if not count:
+                continue
+            if exec_dist is not None:
+                # At least 1 ms, like any task the simulator releases
+                self.exec[rows, j] = np.maximum(exec_dist.sample(self.rng, count), 1)
+            if jitter is not None:
+                self.delay[rows, j] = np.maximum(jitter.sample(self.rng, count), 0)
+
+    def current(self):
+        return self.exec, self.delay
+
+    def advance(self, released):
+        self._draw(released)
+        return self.current()
+
+def _run_batch(args):
+    tasks, sched_type, mode, duration, replications, seed, exec_dist, release_jitter = args
+    rng = np.random.default_rng(seed)
+    batch = LockstepBatch([tasks] * replications, [sched_type] * replications, [mode] * replications)
+    jobs = JobSampler(tasks, replications, rng, exec_dist, release_jitter)
+    results = batch.run(duration, jobs)
+    return {key: results[key] for key in ('cpu_load', 'deadlines_missed', 'task_missed', 'avg_jitter')}
+
+@dataclass
+class MonteCarloResult:
+    """Per-replication metrics: R-length arrays, and R x N for the per-task ones"""
+    names: Sequence[str]
+    cpu_load: np.ndarray
+    deadlines_missed: np.ndarray
+    task_missed: np.ndarray
+    avg_jitter: np.ndarray
+
+    @property
+    def replications(self) -> int:
+        return len(self.cpu_load)
+
+    @staticmethod
+    def interval(values, confidence: float = 0.95) -> dict:
+        """Mean with a normal-approximation confidence interval"""
+        values = np.asarray(values, dtype=float)
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        mean = float(values.mean())
+        half = z * float(values.std(ddof=1)) / math.sqrt(len(values)) if len(values) > 1 else 0.0
+        return {'mean': mean, 'ci_low': mean - half, 'ci_high': mean + half}
+
+    @staticmethod
+    def proportion(hits, confidence: float = 0.95) -> dict:
+        """Probability with a Wilson score interval (sound near 0 and 1)"""
+        n = len(hits)
+        p = float(np.mean(hits))
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return {'mean': p, 'ci_low': max(center - half, 0.0), 'ci_high': min(center + half, 1.0)}
+
+    def summary(self, confidence: float = 0.95) -> dict:
+        return {
+            'replications': self.replications,
+            'confidence': confidence,
+            'cpu_load': self.interval(self.cpu_load, confidence),
+            'deadlines_missed': self.interval(self.deadlines_missed, confidence),
+            'miss_probability': self.proportion(self.deadlines_missed > 0, confidence),
+            'tasks': {name: {
+                'deadlines_missed': self.interval(self.task_missed[:, j], confidence),
+                'miss_probability': self.proportion(self.task_missed[:, j] > 0, confidence),
+                'avg_jitter': self.interval(self.avg_jitter[:, j], confidence),
+            } for j, name in enumerate(self.names)},
+        }
+
+def monte_carlo(tasks, sched_type, mode, duration: int, replications: int = 1000,
+                exec_dist: Optional[Dict[str, object]] = None,
+                release_jitter: Optional[Dict[str, object]] = None,
+                seed: int = 0, batch_size: int = 1000, workers: int = 1) -> MonteCarloResult:
+    """Run `replications` seeded replications of one configuration.
+
+    exec_dist and release_jitter map task names to distributions (Uniform, TruncatedNormal,
+    Empirical); tasks without one keep exec_ms and on-time releases. Replications are
+    simulated batch_size at a time, on a process pool when workers != 1 (None: every
+    core). Each batch has its own seed from `seed`, so results do not depend on workers.
+    """
+    sizes = [min(batch_size, replications - start) for start in range(0, replications, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(tasks, sched_type, mode, duration, size, batch_seed, exec_dist, release_jitter)
+            for size, batch_seed in zip(sizes, seeds)]
+    if workers != 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(jobs))) as executor:
+            parts = list(executor.map(_run_batch, jobs))
+    else:
+        parts = [_run_batch(job) for job in jobs]
+    return MonteCarloResult(
+        names=list(tasks),
+        **{key: np.concatenate([part[key] for part in parts]) for key in
+           ('cpu_load', 'deadlines_missed', 'task_missed', 'avg_jitter')})
@@ -0,0 +1,202 @@
+"""Performance suite for the simulator itself: python perf_suite.py [--grid quick|full] ...
+
+Every case runs in a fresh process so peak memory is per case. Results are written as JSON and,
+given --baseline, compared case by case; slowdowns beyond --tolerance exit with status 1.
+Cases the baseline ran in under --min-wall seconds are timer noise and only get a ratio, and
+--repeat defaults to the baseline's own repeat count (at least 3) so best-of-N compares with
+best-of-N. Wall times only compare on the same, otherwise idle machine: record the baseline
+where the gate runs (python perf_suite.py -o perf_baseline.json) and compare there.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import itertools
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+GRIDS = {
+    "quick": {"task_counts": (3, 10, 100), "durations": (100, 10_000)},
+    "full": {"task_counts": (3, 10, 100, 1000), "durations": (100, 10_000, 1_000_000, 10_000_000)},
+}
+POLICIES = tuple((sched_type, mode)
+                 for sched_type in ("PRIORITY", "ROUND_ROBIN", "EDF", "RATE_MONOTONIC", "DEADLINE_MONOTONIC")
+                 for mode in ("PREEMPTIVE", "COOPERATIVE"))
+BENCHES = ("scheduler", "freertos", "batch", "batch_lockstep")
+# Each process times a case at least MIN_RUNS times and for MIN_SECONDS, keeping the fastest run;
+# single runs vary by tens of percent on a busy or virtualized machine
+MIN_RUNS = 3
+MIN_SECONDS = 0.2
+ENGINES = ("TICK", "EVENT")
+
+def make_task_params(count: int, utilization: float = 0.7, seed: int = 1):
+    """Reproducible task set: log-uniform periods, utilization split at random (UUniFast)"""
+    rng = random.Random(seed * 100003 + count)
+    shares = []
+    remaining = utilization
+    for i in range(count - 1, 0, -1):
+        next_remaining = remaining * rng.random() ** (1 / i)
+        shares.append(remaining - next_remaining)
+        remaining = next_remaining
+    shares.append(remaining)
+    params = {}
+    for i, share in enumerate(shares):
+        period = int(10 ** rng.uniform(1, 4))
+        params[f"T{i}"] = {"period_ms": period, "exec_ms": max(1, round(share * period)),
+                           "priority": rng.randint(0, 9)}
+    return params
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KiB elsewhere
+
+def run_case(case: dict) -> dict:
+    """Time one case in the current process (fastest of several runs); only the simulation is timed"""
+    from scheduler_sim import FreeRTOSScheduler, Scheduler, SchedulerType, SchedulingMode, SimulationEngine, Task
+    from benchmark_simulator import BenchmarkSimulator
+
+    params = make_task_params(case["tasks"])
+    duration = case["duration"]
+    engine = SimulationEngine[case["engine"]]
+
+    def tasks():
+        return {name: Task(name, p["period_ms"], p["exec_ms"], p["priority"]) for name, p in params.items()}
+
+    if case["bench"] == "scheduler":
+        scheduler = Scheduler(tasks(), engine=engine)
+        job = lambda: scheduler.run(duration, SchedulerType[case["sched_type"]], SchedulingMode[case["mode"]])
+        simulated = duration
+    elif case["bench"] == "freertos":
+        scheduler = FreeRTOSScheduler(tasks(), engine=engine)
+        job = lambda: scheduler.run_rtos_simulation(duration)
+        simulated = duration
+    else:
+        variations = [{"sched_type": s, "mode": m} for s, m in POLICIES]
+        lockstep = case["bench"] == "batch_lockstep"
+        job = lambda: BenchmarkSimulator().run_batch(params, variations, duration, lockstep=lockstep)
+        simulated = duration * len(variations)
+
+    before = _peak_rss_kb()
+    wall, runs, spent = None, 0, 0.0
+    with contextlib.redirect_stdout(io.StringIO()):
+        while runs < MIN_RUNS or spent < MIN_SECONDS:
+            start = time.perf_counter()
+            job()
+            elapsed = time.perf_counter() - start
+            wall = elapsed if wall is None else min(wall, elapsed)
+            runs += 1
+            spent += elapsed
+    return {"wall_s": wall, "ticks_per_s": simulated / wall if wall else None, "runs": runs,
+            "peak_rss_kb": _peak_rss_kb(), "start_rss_kb": before}
+
+def build_cases(grid: str, benches=BENCHES, engines=ENGINES, max_work: float = 1e8):
+    """Case dicts for a grid; cases above max_work (tasks x simulated ms) are marked skipped"""
+    spec = GRIDS[grid]
+    cases = []
+    for bench, count, duration, engine in itertools.product(benches, spec["task_counts"], spec["durations"], engines):
+        if bench.startswith("batch") and engine != "TICK":
+            continue  # run_batch always uses the tick engine
+        policies = POLICIES if bench == "scheduler" else [(None, None)]
+        for sched_type, mode in policies:
+            case = {"bench": bench, "tasks": count, "duration": duration, "engine": engine,
+                    "sched_type": sched_type, "mode": mode}
+            work = count * duration * (len(POLICIES) if bench.startswith("batch") else 1)
+            case["status"] = "skipped" if work > max_work else "pending"
+            cases.append(case)
+    return cases
+
+def case_key(case: dict):
+    return tuple(case.get(k) for k in ("bench", "tasks", "duration", "engine", "sched_type", "mode"))
+
+def run_suite(cases, repeat: int = 1, log=print):
+    """Run every pending case `repeat` times in fresh processes, keeping the fastest"""
+    context = multiprocessing.get_context("spawn")
+    for case in cases:
+        if case["status"] == "skipped":
+            continue
+        runs = []
+        for _ in range(repeat):
+            with context.Pool(1) as pool:
+                runs.append(pool.apply(run_case, (case,)))
+        best = min(runs, key=lambda r: r["wall_s"])
+        best["peak_rss_kb"] = max((r["peak_rss_kb"] or 0) for r in runs) or None
+        case.update(best, status="ok")
+        log(f"{case['bench']:>14} tasks={case['tasks']:<5} ms={case['duration']:<9} {case['engine']:<5} "
+            f"{case['sched_type'] or '':<11} {case['mode'] or '':<11} {case['wall_s']:9.4f}s "
+            f"{case['ticks_per_s']:12.0f} ms/s")
+    return cases
+
+def compare(results, baseline, tolerance: float = 0.2, min_wall: float = 0.0):
+    """(case, ratio) for every case slower than the baseline by more than `tolerance`.
+
+    Every compared case gets a baseline_ratio; cases the baseline ran in under min_wall
+    seconds are never reported as regressions.
+    """
+    reference = {case_key(c): c for c in baseline["cases"] if c.get("status") == "ok"}
+    regressions = []
+    for case in results["cases"]:
+        base = reference.get(case_key(case))
+        if case.get("status") != "ok" or base is None or not base["wall_s"]:
+            continue
+        ratio = case["wall_s"] / base["wall_s"]
+        case["baseline_ratio"] = ratio
+        if ratio > 1 + tolerance and base["wall_s"] >= min_wall:
+            regressions.append((case, ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure simulator speed and memory")
+    parser.add_argument("--grid", choices=sorted(GRIDS), default="quick")
+    parser.add_argument("--bench", nargs="+", choices=BENCHES, default=list(BENCHES))
+    parser.add_argument("--engine", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--max-work", type=float, default=1e8,
+                        help="skip cases above this many task-milliseconds")
+    parser.add_argument("--repeat", type=int,
+                        help="runs per case, fastest kept (default 1, or the baseline's repeat and at least 3)")
+    parser.add_argument("-o", "--output", default="perf_results.json")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown ratio over baseline")
+    parser.add_argument("--min-wall", type=float, default=0.01,
+                        help="only gate cases the baseline ran in at least this many seconds")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.repeat is None:
+        args.repeat = max(3, baseline["meta"].get("repeat", 1)) if baseline else 1
+
+    import numpy
+    cases = build_cases(args.grid, args.bench, args.engine, args.max_work)
+    results = {
+        "meta": {"date": datetime.datetime.now().isoformat(timespec="seconds"),
+                 "python": platform.python_version(), "numpy": numpy.__version__,
+                 "platform": platform.platform(), "grid": args.grid, "repeat": args.repeat},
+        "cases": run_suite(cases, args.repeat),
+    }
+
+    status = 0
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance, args.min_wall)
+        for case, ratio in regressions:
+            print(f"REGRESSION {case_key(case)}: {ratio:.2f}x baseline wall time")
+        status = 1 if regressions else 0
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.output}")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import heapq
+from collections import deque
+from itertools import count
+
+class FifoReadyQueue:
+    """Round Robin ready queue: deque order with O(1) membership"""
+    def __init__(self):
+        self._queue = deque()
+        self._members = set()
+
+    def push(self, task):
+        self._queue.append(task)
+        self._members.add(task.name)
+
+    def pop(self):
+        task = self._queue.popleft()
+        self._members.discard(task.name)
+        return task
+
+    def remove(self, task):
+        self._queue.remove(task)
+        self._members.discard(task.name)
+
+    def rotate(self, steps: int):
+        """Move the first `steps` tasks to the back, keeping their order"""
+        self._queue.rotate(-steps)
+
+    def __contains__(self, task):
+        return task.name in self._members
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __iter__(self):
+        return iter(self._queue)
+
+class PriorityReadyQueue:
+    """Priority ready queue: binary heap on (priority, arrival) so equal priorities stay FIFO"""
+    def __init__(self):
+        self._heap = []
+        self._members = set()
+        self._arrival = count()
+
+    def push(self, task):
+        heapq.heappush(self._heap, (task.priority, next(self._arrival), task))
+        self._members.add(task.name)
+
+    def pop(self):
+        """Remove and return the highest priority task (lowest number)"""
+        task = heapq.heappop(self._heap)[2]
+        self._members.discard(task.name)
+        return task
+
+    def __contains__(self, task):
+        return task.name in self._members
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        """Tasks in pop order"""
+        return (entry[2] for entry in sorted(self._heap))
+
+class KeyedReadyQueue:
+    """Ready queue ordered on (key(task), arrival), e.g. absolute deadline for EDF or period
+    for rate-monotonic. Any member can be removed in O(1): its heap entry is dropped lazily."""
+    def __init__(self, key):
+        self._key = key
+        self._heap = []
+        self._live = {}  # name -> arrival stamp of the task's current heap entry
+        self._arrival = count()
+
+    def push(self, task):
+        arrival = next(self._arrival)
+        heapq.heappush(self._heap, (self._key(task), arrival, task))
+        self._live[task.name] = arrival
+
+    def _drop_stale(self):
+        heap, live = self._heap, self._live
+        while heap and live.get(heap[0][2].name) != heap[0][1]:
+            heapq.heappop(heap)
+
+    def peek(self):
+        """The first task in order, left in the queue"""
+        self._drop_stale()
+        return self._heap[0][2]
+
+    def pop(self):
+        self._drop_stale()
+        task = heapq.heappop(self._heap)[2]
+        del self._live[task.name]
+        return task
+
+    def remove(self, task):
+        del self._live[task.name]
+        if len(self._heap) > 2 * len(self._live) + 16:
+            self._heap = [entry for entry in self._heap if self._live.get(entry[2].name) == entry[1]]
+            heapq.heapify(self._heap)
+
+    def __contains__(self, task):
+        return task.name in self._live
+
+    def __len__(self):
+        return len(self._live)
+
+    def __iter__(self):
+        """Tasks in pop order"""
+        return (entry[2] for entry in sorted(self._heap) if self._live.get(entry[2].name) == entry[1])
@@ -0,0 +1,29 @@
+import heapq
+
+class ReleaseCalendar:
+    """Min-heap of upcoming task releases keyed on (next_release, task order)"""
+    def __init__(self, tasks):
+        self._order = {}
+        self._heap = []
+        for order, task in enumerate(tasks):
+            self._order[task.name] = order
+            self._heap.append((task.next_release, order, task))
+        heapq.heapify(self._heap)
+
+    def push(self, task):
+        heapq.heappush(self._heap, (task.next_release, self._order[task.name], task))
+
+    def pop_due(self, now: int):
+        """Remove every task due at or before `now`, returned in task order"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap))
+        if len(due) > 1:
+            due.sort(key=lambda entry: entry[1])
+        return [entry[2] for entry in due]
+
+    def next_release(self, default: int) -> int:
+        return self._heap[0][0] if self._heap else default
+
+    def __len__(self):
+        return len(self._heap)
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import pickle
+import zlib
+from collections import OrderedDict
+from enum import Enum
+from scheduler_sim import SIMULATOR_VERSION, Scheduler
+
+def config_key(tasks, sched_type, mode, duration: int, **options) -> str:
+    """Canonical hash of a run: tasks in dict order (it decides release and tie order),
+    policy, mode, duration, Scheduler options and the simulator version"""
+    rows = []
+    for name, task in tasks.items():
+        if isinstance(task, dict):
+            rows.append([name, task["period_ms"], task["exec_ms"], task["priority"]])
+        else:
+            rows.append([name, task.period_ms, task.exec_ms, task.priority])
+    payload = {
+        "version": SIMULATOR_VERSION,
+        "tasks": rows,
+        "sched_type": sched_type.name,
+        "mode": mode.name,
+        "duration": duration,
+        "options": {key: value.name if isinstance(value, Enum) else value
+                    for key, value in sorted(options.items())},
+    }
+    return hashlib.sha256(json.dumps(payload, separators=(",", ":")).encode()).hexdigest()
+
+class ResultCache:
+    """Memoized simulation results: an in-memory LRU tier plus an optional disk tier.
+
+    Entries hold the run summary (RunMetrics.summary()) and, with keep_traces, a full
+    snapshot the Scheduler is rebuilt from. The disk tier keeps one compressed pickle per
+    key and drops the least recently used files once it exceeds disk_max_bytes; like any
+    pickle, only point it at a directory you trust.
+    """
+    def __init__(self, max_entries: int = 128, disk_dir=None, disk_max_bytes: int = 256 << 20,
+                 keep_traces: bool = False):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.keep_traces = keep_traces
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pkl.z")
+
+    def get(self, key: str):
+        """Cached entry {'summary', 'snapshot'} or None"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        elif self.disk_dir and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), "rb") as f:
+                    entry = pickle.loads(zlib.decompress(f.read()))
+                os.utime(self._path(key))  # Refresh its place in the disk LRU
+            except (OSError, EOFError, zlib.error, pickle.UnpicklingError):
+                entry = None
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, scheduler: Scheduler):
+        """Store a finished run's summary (and snapshot with keep_traces)"""
+        entry = {
+            "summary": scheduler.run_metrics.summary(),
+            "snapshot": scheduler.snapshot() if self.keep_traces else None,
+        }
+        self._remember(key, entry)
+        if self.disk_dir:
+            with open(self._path(key), "wb") as f:
+                f.write(zlib.compress(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)))
+            self._evict_disk()
+        return entry
+
+    def _remember(self, key: str, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        files = [e for e in os.scandir(self.disk_dir) if e.is_file() and e.name.endswith(".pkl.z")]
+        total = sum(e.stat().st_size for e in files)
+        for item in sorted(files, key=lambda e: e.stat().st_mtime):
+            if total <= self.disk_max_bytes:
+                break
+            total -= item.stat().st_size
+            os.remove(item.path)
+
+    def clear(self):
+        self._memory.clear()
+        if self.disk_dir:
+            for item in os.scandir(self.disk_dir):
+                if item.name.endswith(".pkl.z"):
+                    os.remove(item.path)
+
+def restore_scheduler(entry, cls=Scheduler):
+    """Finished scheduler rebuilt from a cached snapshot (None for summary-only entries)"""
+    if entry["snapshot"] is None:
+        return None
+    scheduler = cls.from_snapshot(entry["snapshot"])
+    scheduler.run_until(scheduler.current_time)  # No steps left: just recomputes the final metrics
+    return scheduler
+
+def cached_run(cache, tasks, sched_type, mode, duration: int, cls=Scheduler, **options):
+    """(scheduler, summary) for a run, simulating only on a cache miss.
+
+    The scheduler is None when the hit was stored without its snapshot (keep_traces=False).
+    """
+    key = config_key(tasks, sched_type, mode, duration, **options)
+    entry = cache.get(key)
+    if entry is not None:
+        return restore_scheduler(entry, cls), entry["summary"]
+
+    scheduler = cls(tasks, **options)
+    scheduler.run(duration, sched_type, mode)
+    return scheduler, cache.put(key, scheduler)["summary"]
@@ -0,0 +1,106 @@
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Dict
+
+# Scheduler methods timed per phase; time spent in a nested phase (e.g. logging inside an
+# execution slice) is only counted for the inner one
+PHASES = {
+    '_release_tasks': 'release',
+    '_select_task': 'select',
+    '_execute': 'execute',
+    '_idle': 'execute',
+    '_rotate': 'execute',
+    '_log_slice': 'log',
+}
+
+@dataclass
+class RunStats:
+    """Where a run spent its time and how often the scheduler switched tasks.
+
+    Filled by an instrumented Scheduler (instrument=True) over the milliseconds it actually
+    simulated (simulated_ms, for either engine); cycles skipped by steady_state are not
+    included. `other` in phase_seconds is the loop itself. Context switches count dispatches
+    of a task other than the last one run; preemptions are the switches that leave a task
+    with work remaining.
+    """
+    phase_seconds: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(
+        ['release', 'select', 'execute', 'log', 'other'], 0.0))
+    wall_seconds: float = 0.0
+    simulated_ms: int = 0
+    releases: int = 0
+    context_switches: int = 0
+    preemptions: int = 0
+    queue_high_water: int = 0
+    _accounted: float = 0.0
+    _last_task: object = None
+
+    def _switch_to(self, task, switches_after: int = 0):
+        """Count a dispatch of `task`, plus `switches_after` further back-to-back switches"""
+        last = self._last_task
+        if task is not last:
+            self.context_switches += 1
+            if last is not None and last.remaining_exec > 0:
+                self.preemptions += 1
+        self.context_switches += switches_after
+        self.preemptions += switches_after
+
+    def summary(self) -> dict:
+        return {
+            'wall_seconds': self.wall_seconds,
+            'phase_seconds': dict(self.phase_seconds),
+            'simulated_ms': self.simulated_ms,
+            'releases': self.releases,
+            'context_switches': self.context_switches,
+            'preemptions': self.preemptions,
+            'queue_high_water': self.queue_high_water,
+        }
+
+def _timed(scheduler, method, phase: str):
+    def wrapper(*args):
+        stats = scheduler.run_stats
+        accounted = stats._accounted
+        start = perf_counter()
+        result = method(*args)
+        elapsed = perf_counter() - start
+        own = elapsed - (stats._accounted - accounted)
+        stats.phase_seconds[phase] += own
+        stats._accounted += own
+        return result
+    return wrapper
+
+def instrument_scheduler(scheduler):
+    """Install timing and counting wrappers on this scheduler instance only.
+
+    The class methods stay untouched, so schedulers without instrumentation run the
+    plain methods with no extra checks.
+    """
+    for name, phase in PHASES.items():
+        setattr(scheduler, name, _timed(scheduler, getattr(scheduler, name), phase))
+
+    execute, idle, rotate = scheduler._execute, scheduler._idle, scheduler._rotate
+
+    def counted_execute(ticks):
+        if ticks > 0:
+            scheduler.run_stats._switch_to(scheduler.current_task)
+        result = execute(ticks)
+        if ticks > 0:
+            scheduler.run_stats._last_task = scheduler.current_task
+        return result
+
+    def counted_idle(ticks):
+        scheduler.run_stats._last_task = None
+        return idle(ticks)
+
+    def counted_rotate(ticks):
+        queue = list(scheduler.ready_queue)
+        if len(queue) > 1:
+            # Every tick of a rotation runs a different task, none of which finishes
+            scheduler.run_stats._switch_to(queue[0], ticks - 1)
+            result = rotate(ticks)
+            scheduler.run_stats._last_task = scheduler.current_task
+            return result
+        return rotate(ticks)  # A single task goes through _execute
+
+    scheduler._execute = counted_execute
+    scheduler._idle = counted_idle
+    scheduler._rotate = counted_rotate
@@ -0,0 +1,183 @@
+"""Scheduling policies: how released jobs are queued and which task gets the next slice.
+
+Scheduler calls its policy at four points: on_release after a job is released, pick_next
+when the next slice needs a task, on_tick after the current task ran, and on_complete when
+the running job finishes. Each policy owns its ready structure (new_queue()), and
+event_step lets the event engine apply a whole span at once where the policy allows it.
+"""
+from ready_queue import FifoReadyQueue, KeyedReadyQueue, PriorityReadyQueue
+
+class SchedulingPolicy:
+    # Most queued tasks for which event_step beats ticking through the span (None: any number)
+    event_step_max_queue = None
+
+    def __init__(self, preemptive: bool = True):
+        self.preemptive = preemptive
+
+    def new_queue(self):
+        raise NotImplementedError
+
+    def on_release(self, scheduler, task):
+        """A job of `task` was released (remaining_exec and next_release are already reset)"""
+        if task not in scheduler.ready_queue:
+            scheduler.ready_queue.push(task)
+
+    def pick_next(self, scheduler):
+        """Set scheduler.current_task for the next slice; the ready queue is not empty"""
+        raise NotImplementedError
+
+    def on_tick(self, scheduler, ticks: int):
+        """The current task just ran for `ticks` ms"""
+
+    def on_complete(self, scheduler, task):
+        """The job `task` was running has finished"""
+
+    def state(self):
+        """Policy state that, with the tasks and ready queue, decides the rest of the schedule"""
+        return None
+
+    def event_step(self, scheduler, span: int, queued: int):
+        """Apply the next slices, at most `span` ms with no release in between, unless a
+        cooperative task already holds the CPU (the scheduler runs that one to completion).
+
+        The default is a single tick engine iteration; `queued` is the buffer sample already
+        taken for it, to be repeated for every further millisecond applied.
+        """
+        scheduler._select_task()
+        scheduler._execute(min(1, scheduler.current_task.remaining_exec))
+
+class RoundRobinPolicy(SchedulingPolicy):
+    """1 ms slices in FIFO order: the picked task goes straight back to the end of the queue
+    unless this slice finishes it. Cooperative runs keep the picked task until it completes."""
+    # With two or more tasks queued every tick is a slice of its own, so rotating saves nothing
+    event_step_max_queue = 1
+
+    def new_queue(self):
+        return FifoReadyQueue()
+
+    def pick_next(self, scheduler):
+        if self.preemptive or not scheduler.current_task:
+            scheduler.current_task = scheduler.ready_queue.pop()
+            # For RR, put back at the end if not finished
+            if scheduler.current_task.remaining_exec > 1:
+                scheduler.ready_queue.push(scheduler.current_task)
+
+    def event_step(self, scheduler, span: int, queued: int):
+        # Preemptive RR only rotates the queue until some task is about to finish
+        if self.preemptive:
+            span = scheduler._rotation_span(span)
+            if span > 0:
+                scheduler.metrics['buffer_state'].append_repeat(queued, span - 1)
+                scheduler._rotate(span)
+                return
+        super().event_step(scheduler, span, queued)
+
+class TimeSlicedRoundRobinPolicy(SchedulingPolicy):
+    """Preemptive Round Robin with a `quantum` of several ms.
+
+    A dispatched task is queued again at once, as with 1 ms slices, and keeps the CPU for
+    up to `quantum` ms; it leaves the queue when its job completes.
+    """
+    def __init__(self, quantum: int):
+        super().__init__(preemptive=True)
+        self.quantum = quantum
+        self.used = 0
+
+    def new_queue(self):
+        return FifoReadyQueue()
+
+    def pick_next(self, scheduler):
+        if scheduler.current_task and self.used < self.quantum:
+            return
+        task = scheduler.ready_queue.pop()
+        scheduler.ready_queue.push(task)
+        scheduler.current_task = task
+        self.used = 0
+
+    def on_tick(self, scheduler, ticks: int):
+        self.used += ticks
+
+    def event_step(self, scheduler, span: int, queued: int):
+        # The picked task keeps the CPU until its quantum ends, it completes or the next release
+        scheduler._select_task()
+        ticks = min(span, self.quantum - self.used, scheduler.current_task.remaining_exec)
+        if ticks > 1:
+            scheduler.metrics['buffer_state'].append_repeat(len(scheduler.ready_queue), ticks - 1)
+        scheduler._execute(max(ticks, 0))
+
+    def on_complete(self, scheduler, task):
+        if task in scheduler.ready_queue:
+            scheduler.ready_queue.remove(task)
+
+    def state(self):
+        return self.used
+
+class FixedPriorityPolicy(SchedulingPolicy):
+    """Lowest priority number first, FIFO among equals.
+
+    The picked task leaves the ready queue, so a preempted job only gets the CPU back once
+    it is released again; this is the simulator's original Priority behaviour.
+    """
+    def new_queue(self):
+        return PriorityReadyQueue()
+
+    def pick_next(self, scheduler):
+        if self.preemptive or not scheduler.current_task:
+            # Highest priority task (lowest number) sits at the top of the heap
+            scheduler.current_task = scheduler.ready_queue.pop()
+
+class KeyedPriorityPolicy(SchedulingPolicy):
+    """Runs the first task by key(task); it stays queued until its job completes, so a
+    preempted job resumes once it is first again"""
+    rekey_on_release = False
+
+    def key(self, task):
+        raise NotImplementedError
+
+    def new_queue(self):
+        return KeyedReadyQueue(self.key)
+
+    def on_release(self, scheduler, task):
+        queue = scheduler.ready_queue
+        if task in queue:
+            if not self.rekey_on_release:
+                return
+            queue.remove(task)
+        queue.push(task)
+
+    def pick_next(self, scheduler):
+        if self.preemptive or not scheduler.current_task:
+            scheduler.current_task = scheduler.ready_queue.peek()
+
+    def on_complete(self, scheduler, task):
+        scheduler.ready_queue.remove(task)
+
+    def event_step(self, scheduler, span: int, queued: int):
+        # Keys only change on release, so the first task runs until completion or the next release.
+        # A job that just completed was counted in `queued` but has left the queue since.
+        scheduler._select_task()
+        ticks = min(span, scheduler.current_task.remaining_exec)
+        if ticks > 1:
+            scheduler.metrics['buffer_state'].append_repeat(len(scheduler.ready_queue), ticks - 1)
+        scheduler._execute(max(ticks, 0))
+
+class EDFPolicy(KeyedPriorityPolicy):
+    """Earliest Deadline First: each job's deadline is its task's next release"""
+    rekey_on_release = True
+
+    def key(self, task):
+        return task.next_release
+
+class RateMonotonicPolicy(KeyedPriorityPolicy):
+    """Shortest period first, ignoring the priority field"""
+    def key(self, task):
+        return task.period_ms
+
+class DeadlineMonotonicPolicy(KeyedPriorityPolicy):
+    """Shortest relative deadline first. Deadlines are implicit (equal to the period) in this
+    simulator, so the order matches rate-monotonic; relative_deadline is the hook to change."""
+    def relative_deadline(self, task):
+        return task.period_ms
+
+    def key(self, task):
+        return self.relative_deadline(task)
@@ -0,0 +1,123 @@
+import math
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Optional
+
+class Verdict(Enum):
+    SCHEDULABLE = "Schedulable"      # Every job meets its deadline (RTA or a utilization bound)
+    UNSCHEDULABLE = "Unschedulable"  # Some task's worst-case response exceeds its period
+    OVERLOADED = "Overloaded"        # Utilization above 1, deadlines are missed whatever the policy
+
+@dataclass
+class SchedulabilityReport:
+    utilization: float
+    liu_layland_bound: float
+    hyperbolic_product: float
+    rate_monotonic: bool
+    verdict: Verdict
+    # Worst-case response time per task, None where it exceeds the period (deadline)
+    wcrt: Dict[str, Optional[int]] = field(default_factory=dict)
+
+def _task_params(tasks):
+    """(name, period_ms, exec_ms, priority) from Task/TaskParams objects or param dicts"""
+    params = []
+    for name, task in tasks.items():
+        if isinstance(task, dict):
+            params.append((name, task["period_ms"], task["exec_ms"], task["priority"]))
+        else:
+            params.append((name, task.period_ms, task.exec_ms, task.priority))
+    return params
+
+def utilization(tasks) -> float:
+    return sum(exec_ms / period for _, period, exec_ms, _ in _task_params(tasks))
+
+def liu_layland_bound(n: int) -> float:
+    """Rate-monotonic utilization bound n(2^(1/n) - 1)"""
+    return n * (2 ** (1 / n) - 1) if n else 1.0
+
+def hyperbolic_product(tasks) -> float:
+    """prod(U_i + 1); rate-monotonic sets with a product <= 2 are schedulable (Bini et al.)"""
+    return math.prod(exec_ms / period + 1 for _, period, exec_ms, _ in _task_params(tasks))
+
+def is_rate_monotonic(tasks) -> bool:
+    """True when a shorter period never has a lower priority (higher number)"""
+    params = sorted(_task_params(tasks), key=lambda p: (p[1], p[3]))
+    return all(a[3] <= b[3] for a, b in zip(params, params[1:]))
+
+def response_time_analysis(tasks) -> Dict[str, Optional[int]]:
+    """Exact worst-case response times for fixed-priority preemptive scheduling.
+
+    Deadlines equal periods and all tasks release together at t=0 (the critical instant),
+    as in Scheduler.run. Tasks of equal priority are counted as interfering with each other.
+    """
+    params = _task_params(tasks)
+    wcrt = {}
+    for name, period, exec_ms, priority in params:
+        interferers = [(p, c) for other, p, c, prio in params if other != name and prio <= priority]
+        response = exec_ms + sum(c for _, c in interferers)
+        while True:
+            if response > period:
+                wcrt[name] = None
+                break
+            demand = exec_ms + sum(math.ceil(response / p) * c for p, c in interferers)
+            if demand == response:
+                wcrt[name] = response
+                break
+            response = demand
+    return wcrt
+
+def busy_time(tasks, duration: int) -> int:
+    """CPU time used in [0, duration) when every job runs to completion and the CPU never
+    idles with work pending.
+
+    Jobs are released at t=0 and then every period, as in Scheduler.run. Any such schedule
+    is busy this long whatever order it runs the jobs in.
+    """
+    releases = sorted((release, exec_ms) for _, period, exec_ms, _ in _task_params(tasks)
+                      for release in range(0, duration, period))
+    busy = backlog = now = 0
+    for release, exec_ms in releases:
+        ran = min(backlog, release - now)
+        busy += ran
+        backlog += exec_ms - ran
+        now = release
+    return busy + min(backlog, duration - now)
+
+def analyze_edf(tasks) -> SchedulabilityReport:
+    """Exact test for preemptive EDF with deadlines equal to periods: schedulable iff U <= 1.
+
+    No response times are computed, so wcrt is empty for a schedulable set.
+    """
+    params = _task_params(tasks)
+    if any(period <= 0 for _, period, _, _ in params):
+        raise ValueError("Schedulability analysis needs positive periods")
+    u = utilization(tasks)
+    overloaded = u > 1
+    return SchedulabilityReport(u, liu_layland_bound(len(params)), hyperbolic_product(tasks),
+                                is_rate_monotonic(tasks),
+                                Verdict.OVERLOADED if overloaded else Verdict.SCHEDULABLE,
+                                {name: None for name, _, _, _ in params} if overloaded else {})
+
+def analyze(tasks) -> SchedulabilityReport:
+    """Cheap utilization tests first, exact response-time analysis for the rest"""
+    params = _task_params(tasks)
+    if any(period <= 0 for _, period, _, _ in params):
+        raise ValueError("Schedulability analysis needs positive periods")
+
+    u = utilization(tasks)
+    bound = liu_layland_bound(len(params))
+    product = hyperbolic_product(tasks)
+    rate_monotonic = is_rate_monotonic(tasks)
+
+    if u > 1:
+        return SchedulabilityReport(u, bound, product, rate_monotonic, Verdict.OVERLOADED,
+                                    {name: None for name, _, _, _ in params})
+
+    # A passing bound settles the verdict; RTA still reports the response times (and counts
+    # equal-priority tasks as interfering, so it can be more pessimistic than the bound)
+    wcrt = response_time_analysis(tasks)
+    if rate_monotonic and (u <= bound or product <= 2):
+        verdict = Verdict.SCHEDULABLE
+    else:
+        verdict = Verdict.SCHEDULABLE if all(r is not None for r in wcrt.values()) else Verdict.UNSCHEDULABLE
+    return SchedulabilityReport(u, bound, product, rate_monotonic, verdict, wcrt)
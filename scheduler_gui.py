@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
 from io import BytesIO
 import traceback
@@ -11,13 +10,45 @@ import base64
 import csv
 import datetime
 import tempfile
+import threading
 import webbrowser
 from PIL import Image, ImageTk
 
 # Import your existing modules
-from scheduler_sim import Scheduler, SchedulerType, SchedulingMode, Task, FreeRTOSScheduler
+from scheduler_sim import Scheduler, SchedulerType, SchedulingMode, FreeRTOSScheduler
 from benchmark_simulator import BenchmarkSimulator
 from task_manager import TaskManager
+from gantt_plot import GanttViewport, draw_gantt
+from result_cache import ResultCache, config_key, restore_scheduler
+from design_sweep import spec_variations, sweep
+
+class BackgroundJob:
+    """Runs work(job) on a worker thread; the GUI polls progress and done with root.after"""
+    def __init__(self, work):
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.done = False
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(work,), daemon=True)
+        
+    def _run(self, work):
+        try:
+            self.result = work(self)
+        except Exception as e:
+            self.error = f"{str(e)}\n\n{traceback.format_exc()}"
+        finally:
+            self.done = True
+            
+    def start(self):
+        self._thread.start()
+        
+    def cancel(self):
+        self._cancel.set()
+        
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
 
 class SchedulerGUI:
     def __init__(self, root):
@@ -38,6 +69,12 @@ class SchedulerGUI:
         self.last_bench_img = None
         self.last_gantt_img = None
         self.last_rtos_img = None
+        self.gantt_view = None
+        self.rtos_view = None
+        self.job = None
+        
+        # Finished runs by configuration, so repeating one does not simulate it again
+        self.result_cache = ResultCache(keep_traces=True)
         
         # Create the main layout
         self.create_widgets()
@@ -73,11 +110,20 @@ class SchedulerGUI:
         self.notebook.add(self.benchmark_tab, text='Benchmarking')
         self.notebook.add(self.freertos_tab, text='FreeRTOS')
         
-        # Create status bar
+        # Create status bar with progress of the running job
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        
         self.status_var = tk.StringVar()
         self.status_var.set("Ready")
-        status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
-        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
+        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.cancel_button = ttk.Button(status_frame, text="Cancel", command=self.cancel_job, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT, padx=5)
+        self.progress_var = tk.DoubleVar(value=0)
+        ttk.Progressbar(status_frame, variable=self.progress_var, maximum=100,
+                        length=200).pack(side=tk.RIGHT, padx=5)
         
         # Build each tab
         self.create_simulation_tab()
@@ -146,7 +192,7 @@ class SchedulerGUI:
         ttk.Label(sched_left, text="Scheduler Type:").grid(row=0, column=0, sticky='w', pady=2)
         self.sched_type_var = tk.StringVar(value="Priority")
         sched_combo = ttk.Combobox(sched_left, textvariable=self.sched_type_var, 
-                                  values=['Priority', 'Round Robin'], width=15, state='readonly')
+                                  values=[s.value for s in SchedulerType], width=22, state='readonly')
         sched_combo.grid(row=1, column=0, sticky='w', pady=2)
         
         ttk.Label(sched_left, text="Scheduling Mode:").grid(row=2, column=0, sticky='w', pady=2)
@@ -195,6 +241,7 @@ class SchedulerGUI:
         self.gantt_fig = Figure(figsize=(12, 5), dpi=100)
         self.gantt_canvas = FigureCanvasTkAgg(self.gantt_fig, gantt_frame)
         self.gantt_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        NavigationToolbar2Tk(self.gantt_canvas, gantt_frame)  # Zoom/pan re-renders the visible window
         
         # Metrics text
         metrics_frame = ttk.Frame(results_frame)
@@ -221,7 +268,8 @@ class SchedulerGUI:
         info_label.pack(padx=10, pady=5)
         
         # Variations Frame
-        variations_frame = ttk.LabelFrame(self.benchmark_tab, text="Variations")
+        variations_frame = ttk.LabelFrame(self.benchmark_tab,
+                                          text="Variations (a list, or a sweep spec with \"grid\" or \"random\")")
         variations_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         # Variations text area
@@ -304,6 +352,7 @@ class SchedulerGUI:
         self.rtos_fig = Figure(figsize=(12, 5), dpi=100)
         self.rtos_canvas = FigureCanvasTkAgg(self.rtos_fig, rtos_gantt_frame)
         self.rtos_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        NavigationToolbar2Tk(self.rtos_canvas, rtos_gantt_frame)
         
         # RTOS results text
         rtos_text_frame = ttk.Frame(rtos_results_frame)
@@ -379,6 +428,49 @@ class SchedulerGUI:
         self.update_task_table()
         self.status_var.set("Tasks reset to defaults")
         
+    def start_job(self, status, work, on_done, error_status, error_title):
+        """Run work(job) off the Tk thread, then on_done(result) here once it finishes"""
+        self.job = BackgroundJob(work)
+        self.status_var.set(status)
+        self.progress_var.set(0)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.job.start()
+        self.root.after(50, self.poll_job, on_done, error_status, error_title)
+        
+    def poll_job(self, on_done, error_status, error_title):
+        job = self.job
+        self.progress_var.set(job.progress * 100)
+        if not job.done:
+            self.root.after(50, self.poll_job, on_done, error_status, error_title)
+            return
+        
+        self.job = None
+        self.cancel_button.config(state=tk.DISABLED)
+        if job.error:
+            self.status_var.set(error_status)
+            messagebox.showerror("Error", f"{error_title}: {job.error}")
+        elif job.cancelled:
+            self.progress_var.set(0)
+            self.status_var.set("Cancelled")
+        else:
+            try:
+                on_done(job.result)
+            except Exception as e:
+                self.status_var.set(error_status)
+                error_msg = f"{error_title}: {str(e)}\n\n{traceback.format_exc()}"
+                messagebox.showerror("Error", error_msg)
+                
+    def cancel_job(self):
+        if self.job:
+            self.job.cancel()
+            self.status_var.set("Cancelling...")
+            
+    def job_running(self):
+        if self.job:
+            messagebox.showinfo("Busy", "Wait for the current run to finish or cancel it first.")
+            return True
+        return False
+        
     def create_gantt_chart(self, gantt_data, max_time=100, figsize=(14, 6), dpi=100):
         """Create a Gantt chart visualization with improved visibility"""
         if not gantt_data:
@@ -387,122 +479,97 @@ class SchedulerGUI:
         fig = Figure(figsize=figsize, dpi=dpi)
         ax = fig.add_subplot(111)
         
-        # Get unique tasks and assign colors
-        tasks = sorted(set([item[0] for item in gantt_data]))
-        colors = plt.cm.tab10.colors
-        color_map = {task: colors[i % len(colors)] for i, task in enumerate(tasks)}
-        
-        # Create y-axis positions
-        y_pos = {task: i for i, task in enumerate(tasks)}
-        
-        # Plot each task execution
-        for entry in gantt_data:
-            task, start, end = entry
-            ax.barh(y_pos[task], end-start, left=start, 
-                    height=0.6, color=color_map[task], label=task)
-        
-        ax.set_yticks(list(range(len(tasks))))
-        ax.set_yticklabels(tasks, fontsize=10)
-        ax.set_xlabel('Time (ms)', fontsize=12)
-        ax.set_title('Task Execution Timeline', fontsize=14)
-        ax.grid(True, axis='x', linestyle='--', alpha=0.7)
-        ax.set_xlim(0, max_time)
-        ax.tick_params(axis='x', labelsize=10)
+        # Draw one collection per task row
+        draw_gantt(ax, gantt_data, max_time)
         
         return fig
         
     def run_simulation(self):
+        if self.job_running():
+            return
         try:
-            self.status_var.set("Preparing simulation...")
-            self.root.update()
-            
-            # Get tasks from manager
-            tasks_dict = {}
-            for name, params in self.task_manager.get_task_dict().items():
-                tasks_dict[name] = Task(
-                    name=name,
-                    period_ms=params["period_ms"],
-                    exec_ms=params["exec_ms"],
-                    priority=params["priority"]
-                )
+            # The scheduler reads the task manager's table directly
+            tasks = self.task_manager.tasks
                 
-            if not tasks_dict:
+            if not tasks:
                 messagebox.showerror("Error", "Please define at least one task!")
                 return
                 
-            # Run simulation
-            scheduler = Scheduler(tasks_dict)
-            s_type = SchedulerType.PRIORITY if self.sched_type_var.get() == 'Priority' else SchedulerType.ROUND_ROBIN
+            s_type = SchedulerType(self.sched_type_var.get())
             mode = SchedulingMode.PREEMPTIVE if self.sched_mode_var.get() == 'Preemptive' else SchedulingMode.COOPERATIVE
+            duration = int(self.duration_var.get())
+            # The time quantum only applies to Round Robin
+            options = {"rr_quantum": int(self.quantum_var.get())} if s_type == SchedulerType.ROUND_ROBIN else {}
+            
+            key = config_key(tasks, s_type, mode, duration, **options)
+            cached = self.result_cache.get(key)
+            if cached:
+                self.show_simulation(restore_scheduler(cached), duration)
+                self.status_var.set("Simulation complete! (cached result)")
+                return
+                
+            # Run simulation in the background
+            scheduler = Scheduler(tasks, **options)
             
-            self.last_sim_duration = int(self.duration_var.get())
-            scheduler.run(self.last_sim_duration, s_type, mode)
-            self.last_scheduler = scheduler
-            
-            # Update UI
-            self.gantt_fig.clf()
-            ax = self.gantt_fig.add_subplot(111)
-            
-            # Get unique tasks and assign colors
-            gantt_data = scheduler.gantt_log
-            tasks = sorted(set([item[0] for item in gantt_data]))
-            colors = plt.cm.tab10.colors
-            color_map = {task: colors[i % len(colors)] for i, task in enumerate(tasks)}
-            
-            # Create y-axis positions
-            y_pos = {task: i for i, task in enumerate(tasks)}
-            
-            # Plot each task execution
-            for entry in gantt_data:
-                task, start, end = entry
-                ax.barh(y_pos[task], end-start, left=start, 
-                        height=0.6, color=color_map[task], label=task)
-            
-            ax.set_yticks(list(range(len(tasks))))
-            ax.set_yticklabels(tasks, fontsize=10)
-            ax.set_xlabel('Time (ms)', fontsize=12)
-            ax.set_title('Task Execution Timeline', fontsize=14)
-            ax.grid(True, axis='x', linestyle='--', alpha=0.7)
-            ax.set_xlim(0, self.last_sim_duration)
-            ax.tick_params(axis='x', labelsize=10)
-            
-            self.gantt_canvas.draw()
-            
-            # Create image for export
-            buf = BytesIO()
-            self.gantt_fig.savefig(buf, format='png', bbox_inches='tight')
-            self.last_gantt_img = buf.getvalue()
-            
-            # Show metrics
-            metrics_text = (
-                f"CPU Load: {scheduler.metrics['cpu_load']:.2%}\n"
-                f"Idle Time: {scheduler.metrics['cpu_idle']} ms\n"
-                f"Busy Time: {scheduler.metrics['cpu_busy']} ms\n"
-                f"Missed Deadlines: {scheduler.metrics['deadlines_missed']}\n"
-                f"Buffer Usage (avg): {sum(scheduler.metrics['buffer_state'])/len(scheduler.metrics['buffer_state']):.2f}"
-            )
-            
-            self.metrics_text.config(state=tk.NORMAL)
-            self.metrics_text.delete(1.0, tk.END)
-            self.metrics_text.insert(1.0, metrics_text)
-            self.metrics_text.config(state=tk.DISABLED)
+            def work(job):
+                for now in scheduler.run_steps(duration, s_type, mode):
+                    job.progress = now / duration if duration > 0 else 1
+                    if job.cancelled:
+                        return None
+                self.result_cache.put(key, scheduler)
+                return scheduler
             
-            self.status_var.set("Simulation complete!")
+            self.start_job("Running simulation...", work,
+                           lambda result: self.show_simulation(result, duration),
+                           "Error occurred", "Simulation Error")
             
         except Exception as e:
             self.status_var.set("Error occurred")
             error_msg = f"Simulation Error: {str(e)}\n\n{traceback.format_exc()}"
             messagebox.showerror("Error", error_msg)
             
+    def show_simulation(self, scheduler, duration):
+        self.last_sim_duration = duration
+        self.last_scheduler = scheduler
+        
+        # Update UI
+        self.gantt_fig.clf()
+        ax = self.gantt_fig.add_subplot(111)
+        
+        # Only the visible window is drawn, binned per pixel when zoomed out
+        self.gantt_view = GanttViewport(ax, scheduler.gantt_log, self.last_sim_duration)
+        
+        self.gantt_canvas.draw()
+        
+        # Create image for export
+        buf = BytesIO()
+        self.gantt_fig.savefig(buf, format='png', bbox_inches='tight')
+        self.last_gantt_img = buf.getvalue()
+        
+        # Show metrics
+        metrics_text = (
+            f"CPU Load: {scheduler.metrics['cpu_load']:.2%}\n"
+            f"Idle Time: {scheduler.metrics['cpu_idle']} ms\n"
+            f"Busy Time: {scheduler.metrics['cpu_busy']} ms\n"
+            f"Missed Deadlines: {scheduler.metrics['deadlines_missed']}\n"
+            f"Buffer Usage (avg): {scheduler.run_metrics.buffer_average:.2f}"
+        )
+        
+        self.metrics_text.config(state=tk.NORMAL)
+        self.metrics_text.delete(1.0, tk.END)
+        self.metrics_text.insert(1.0, metrics_text)
+        self.metrics_text.config(state=tk.DISABLED)
+        
+        self.status_var.set("Simulation complete!")
+        
     def run_benchmark(self):
+        if self.job_running():
+            return
         try:
-            self.status_var.set("Preparing benchmark...")
-            self.root.update()
-            
-            # Get tasks from manager
-            tasks_dict = self.task_manager.get_task_dict()
+            # Get tasks from manager (a copy, as the table stays editable while this runs)
+            tasks = self.task_manager.tasks.copy()
             
-            if not tasks_dict:
+            if not tasks:
                 messagebox.showerror("Error", "Please define tasks in the table!")
                 return
                 
@@ -514,150 +581,169 @@ class SchedulerGUI:
                 
             try:
                 variations = ast.literal_eval(variations_text)
+                # A sweep spec expands into variations; duplicates and dominated points are skipped
+                is_sweep = isinstance(variations, dict)
+                if is_sweep:
+                    variations = list(spec_variations(variations))
             except Exception as e:
                 messagebox.showerror("Error", f"Error parsing variations: {str(e)}")
                 return
                 
-            # Run benchmark
+            # Run benchmark in the background, one configuration at a time
             benchmark = BenchmarkSimulator()
-            self.last_bench_duration = int(self.bench_duration_var.get())
-            benchmark.run_batch(tasks_dict, variations, self.last_bench_duration)
-            self.last_benchmark = benchmark
-            
-            # Update UI
-            self.bench_fig.clf()
-            ax1 = self.bench_fig.add_subplot(211)
-            ax2 = self.bench_fig.add_subplot(212)
-            
-            # CPU Load plot
-            config_ids = [f"Config {i}" for i in range(len(benchmark.comparison_data))]
-            cpu_loads = [d['cpu_load'] for d in benchmark.comparison_data]
-            ax1.bar(config_ids, cpu_loads, color='skyblue')
-            ax1.set_title("CPU Utilization Comparison", fontsize=14)
-            ax1.set_ylabel("CPU Load", fontsize=12)
-            ax1.set_ylim(0, 1)
-            ax1.tick_params(axis='x', labelsize=10)
-            ax1.tick_params(axis='y', labelsize=10)
-            
-            # Add value labels
-            for i, v in enumerate(cpu_loads):
-                ax1.text(i, v + 0.02, f"{v:.1%}", ha='center', fontsize=10)
-            
-            # Missed deadlines plot
-            deadlines = [d['missed_deadlines'] for d in benchmark.comparison_data]
-            ax2.bar(config_ids, deadlines, color='lightcoral')
-            ax2.set_title("Missed Deadlines Comparison", fontsize=14)
-            ax2.set_ylabel("Count", fontsize=12)
-            ax2.tick_params(axis='x', labelsize=10)
-            ax2.tick_params(axis='y', labelsize=10)
-            
-            # Add value labels
-            for i, v in enumerate(deadlines):
-                ax2.text(i, v + 0.1, str(v), ha='center', fontsize=10)
-            
-            self.bench_fig.tight_layout()
-            self.bench_canvas.draw()
-            
-            # Create image for export
-            buf = BytesIO()
-            self.bench_fig.savefig(buf, format='png', bbox_inches='tight')
-            self.last_bench_img = buf.getvalue()
-            
-            # Show summary
-            summary = f"Benchmark complete! {len(variations)} configurations tested.\n"
-            summary += f"Average CPU Load: {sum(c['cpu_load'] for c in benchmark.comparison_data)/len(benchmark.comparison_data):.2%}\n"
-            summary += f"Total Missed Deadlines: {sum(c['missed_deadlines'] for c in benchmark.comparison_data)}"
-            
-            self.bench_results_text.config(state=tk.NORMAL)
-            self.bench_results_text.delete(1.0, tk.END)
-            self.bench_results_text.insert(1.0, summary)
-            self.bench_results_text.config(state=tk.DISABLED)
-            
-            self.status_var.set("Benchmark complete!")
+            duration = int(self.bench_duration_var.get())
+            
+            def work(job):
+                if is_sweep:
+                    rows = sweep(tasks, variations, duration, cache=self.result_cache)
+                else:
+                    rows = benchmark.iter_batch(tasks, variations, duration, cache=self.result_cache)
+                for i, comp_entry in enumerate(rows):
+                    benchmark.comparison_data.append(comp_entry)
+                    job.progress = (i + 1) / len(variations)
+                    if job.cancelled:
+                        return None
+                return benchmark
+            
+            self.start_job("Running benchmark...", work,
+                           lambda result: self.show_benchmark(result, duration, len(variations)),
+                           "Benchmark failed", "Benchmark Error")
             
         except Exception as e:
             self.status_var.set("Benchmark failed")
             error_msg = f"Benchmark Error: {str(e)}\n\n{traceback.format_exc()}"
             messagebox.showerror("Error", error_msg)
             
+    def show_benchmark(self, benchmark, duration, count):
+        self.last_bench_duration = duration
+        self.last_benchmark = benchmark
+        
+        # Update UI
+        self.bench_fig.clf()
+        ax1 = self.bench_fig.add_subplot(211)
+        ax2 = self.bench_fig.add_subplot(212)
+        
+        # CPU Load plot (configurations a sweep pruned have no metrics)
+        simulated = [d for d in benchmark.comparison_data if d['cpu_load'] is not None]
+        config_ids = [f"Config {d['config_id']}" for d in simulated]
+        cpu_loads = [d['cpu_load'] for d in simulated]
+        ax1.bar(config_ids, cpu_loads, color='skyblue')
+        ax1.set_title("CPU Utilization Comparison", fontsize=14)
+        ax1.set_ylabel("CPU Load", fontsize=12)
+        ax1.set_ylim(0, 1)
+        ax1.tick_params(axis='x', labelsize=10)
+        ax1.tick_params(axis='y', labelsize=10)
+        
+        # Add value labels
+        for i, v in enumerate(cpu_loads):
+            ax1.text(i, v + 0.02, f"{v:.1%}", ha='center', fontsize=10)
+        
+        # Missed deadlines plot
+        deadlines = [d['missed_deadlines'] for d in simulated]
+        ax2.bar(config_ids, deadlines, color='lightcoral')
+        ax2.set_title("Missed Deadlines Comparison", fontsize=14)
+        ax2.set_ylabel("Count", fontsize=12)
+        ax2.tick_params(axis='x', labelsize=10)
+        ax2.tick_params(axis='y', labelsize=10)
+        
+        # Add value labels
+        for i, v in enumerate(deadlines):
+            ax2.text(i, v + 0.1, str(v), ha='center', fontsize=10)
+        
+        self.bench_fig.tight_layout()
+        self.bench_canvas.draw()
+        
+        # Create image for export
+        buf = BytesIO()
+        self.bench_fig.savefig(buf, format='png', bbox_inches='tight')
+        self.last_bench_img = buf.getvalue()
+        
+        # Show summary
+        summary = f"Benchmark complete! {count} configurations tested.\n"
+        if len(simulated) < count:
+            summary += f"{count - len(simulated)} skipped as dominated by a configuration missing deadlines.\n"
+        summary += f"Average CPU Load: {sum(cpu_loads)/max(len(cpu_loads), 1):.2%}\n"
+        summary += f"Total Missed Deadlines: {sum(deadlines)}"
+        
+        self.bench_results_text.config(state=tk.NORMAL)
+        self.bench_results_text.delete(1.0, tk.END)
+        self.bench_results_text.insert(1.0, summary)
+        self.bench_results_text.config(state=tk.DISABLED)
+        
+        self.status_var.set("Benchmark complete!")
+        
     def run_rtos(self):
+        if self.job_running():
+            return
         try:
-            self.status_var.set("Preparing FreeRTOS simulation...")
-            self.root.update()
-            
-            # Get tasks from manager
-            tasks_dict = {}
-            for name, params in self.task_manager.get_task_dict().items():
-                tasks_dict[name] = Task(
-                    name=name,
-                    period_ms=params["period_ms"],
-                    exec_ms=params["exec_ms"],
-                    priority=params["priority"]
-                )
+            # The scheduler reads the task manager's table directly
+            tasks = self.task_manager.tasks
                 
-            if not tasks_dict:
+            if not tasks:
                 messagebox.showerror("Error", "Please define tasks in the table!")
                 return
                 
-            # Run simulation
-            rtos_scheduler = FreeRTOSScheduler(tasks_dict)
-            self.last_rtos_duration = int(self.rtos_duration_var.get())
-            rtos_scheduler.run_rtos_simulation(self.last_rtos_duration)
-            self.last_rtos = rtos_scheduler
-            
-            # Update UI
-            self.rtos_fig.clf()
-            ax = self.rtos_fig.add_subplot(111)
-            
-            # Get unique tasks and assign colors
-            gantt_data = rtos_scheduler.gantt_log
-            tasks = sorted(set([item[0] for item in gantt_data]))
-            colors = plt.cm.tab10.colors
-            color_map = {task: colors[i % len(colors)] for i, task in enumerate(tasks)}
-            
-            # Create y-axis positions
-            y_pos = {task: i for i, task in enumerate(tasks)}
-            
-            # Plot each task execution
-            for entry in gantt_data:
-                task, start, end = entry
-                ax.barh(y_pos[task], end-start, left=start, 
-                        height=0.6, color=color_map[task], label=task)
-            
-            ax.set_yticks(list(range(len(tasks))))
-            ax.set_yticklabels(tasks, fontsize=10)
-            ax.set_xlabel('Time (ms)', fontsize=12)
-            ax.set_title('FreeRTOS Task Execution Timeline', fontsize=14)
-            ax.grid(True, axis='x', linestyle='--', alpha=0.7)
-            ax.set_xlim(0, self.last_rtos_duration)
-            ax.tick_params(axis='x', labelsize=10)
-            
-            self.rtos_canvas.draw()
-            
-            # Create image for export
-            buf = BytesIO()
-            self.rtos_fig.savefig(buf, format='png', bbox_inches='tight')
-            self.last_rtos_img = buf.getvalue()
-            
-            # Show metrics
-            metrics_text = (
-                f"FreeRTOS Simulation Results\n"
-                f"CPU Load: {rtos_scheduler.metrics['cpu_load']:.2%}\n"
-                f"Missed Deadlines: {rtos_scheduler.metrics['deadlines_missed']}"
-            )
+            duration = int(self.rtos_duration_var.get())
+            key = config_key(tasks, *FreeRTOSScheduler.POLICY, duration)
+            cached = self.result_cache.get(key)
+            if cached:
+                self.show_rtos(restore_scheduler(cached, FreeRTOSScheduler), duration)
+                self.status_var.set("FreeRTOS simulation complete! (cached result)")
+                return
+                
+            # Run simulation in the background
+            rtos_scheduler = FreeRTOSScheduler(tasks)
             
-            self.rtos_results_text.config(state=tk.NORMAL)
-            self.rtos_results_text.delete(1.0, tk.END)
-            self.rtos_results_text.insert(1.0, metrics_text)
-            self.rtos_results_text.config(state=tk.DISABLED)
+            def work(job):
+                for now in rtos_scheduler.run_rtos_steps(duration):
+                    job.progress = now / duration if duration > 0 else 1
+                    if job.cancelled:
+                        return None
+                self.result_cache.put(key, rtos_scheduler)
+                return rtos_scheduler
             
-            self.status_var.set("FreeRTOS simulation complete!")
+            self.start_job("Running FreeRTOS simulation...", work,
+                           lambda result: self.show_rtos(result, duration),
+                           "FreeRTOS error", "FreeRTOS Error")
             
         except Exception as e:
             self.status_var.set("FreeRTOS error")
             error_msg = f"FreeRTOS Error: {str(e)}\n\n{traceback.format_exc()}"
             messagebox.showerror("Error", error_msg)
             
+    def show_rtos(self, rtos_scheduler, duration):
+        self.last_rtos_duration = duration
+        self.last_rtos = rtos_scheduler
+        
+        # Update UI
+        self.rtos_fig.clf()
+        ax = self.rtos_fig.add_subplot(111)
+        
+        # Only the visible window is drawn, binned per pixel when zoomed out
+        self.rtos_view = GanttViewport(ax, rtos_scheduler.gantt_log, self.last_rtos_duration,
+                                       'FreeRTOS Task Execution Timeline')
+        
+        self.rtos_canvas.draw()
+        
+        # Create image for export
+        buf = BytesIO()
+        self.rtos_fig.savefig(buf, format='png', bbox_inches='tight')
+        self.last_rtos_img = buf.getvalue()
+        
+        # Show metrics
+        metrics_text = (
+            f"FreeRTOS Simulation Results\n"
+            f"CPU Load: {rtos_scheduler.metrics['cpu_load']:.2%}\n"
+            f"Missed Deadlines: {rtos_scheduler.metrics['deadlines_missed']}"
+        )
+        
+        self.rtos_results_text.config(state=tk.NORMAL)
+        self.rtos_results_text.delete(1.0, tk.END)
+        self.rtos_results_text.insert(1.0, metrics_text)
+        self.rtos_results_text.config(state=tk.DISABLED)
+        
+        self.status_var.set("FreeRTOS simulation complete!")
+        
     def view_gantt(self):
         if self.last_gantt_img:
             self.open_image_in_viewer(self.last_gantt_img)
@@ -696,7 +782,7 @@ class SchedulerGUI:
             if self.last_scheduler:
                 filename = filedialog.asksaveasfilename(
                     defaultextension=".csv",
-                    filetypes=[("CSV Files", "*.csv")]
+                    filetypes=[("CSV Files", "*.csv"), ("Gzipped CSV Files", "*.csv.gz")]
                 )
                 if filename:
                     success = self.last_scheduler.export_csv(filename)
@@ -732,8 +818,9 @@ class SchedulerGUI:
         except Exception as e:
             messagebox.showerror("Error", f"Export Error: {str(e)}")
             
-    def export_metrics_to_csv(self, metrics, filename):
+    def export_metrics_to_csv(self, run_metrics, filename):
         """Export metrics to CSV file"""
+        metrics = run_metrics.metrics
         try:
             with open(filename, 'w', newline='') as f:
                 writer = csv.writer(f)
@@ -742,14 +829,12 @@ class SchedulerGUI:
                 writer.writerow(["Idle Time", f"{metrics['cpu_idle']} ms"])
                 writer.writerow(["Busy Time", f"{metrics['cpu_busy']} ms"])
                 writer.writerow(["Missed Deadlines", metrics['deadlines_missed']])
-                writer.writerow(["Buffer State (avg)", f"{sum(metrics['buffer_state'])/len(metrics['buffer_state']):.2f}"])
+                writer.writerow(["Buffer State (avg)", f"{run_metrics.buffer_average:.2f}"])
                 
                 writer.writerow([])
                 writer.writerow(["Task", "Deadlines Missed", "Avg Jitter (ms)"])
-                for name in metrics['task_jitter']:
-                    jitters = metrics['task_jitter'][name]
-                    avg_jitter = sum(jitters)/len(jitters) if jitters else 0
-                    writer.writerow([name, metrics.get(name+'_missed', 'N/A'), f"{avg_jitter:.2f}"])
+                for name, task in run_metrics.tasks.items():
+                    writer.writerow([name, task.deadline_missed, f"{run_metrics.avg_jitter(name):.2f}"])
             return True
         except Exception as e:
             messagebox.showerror("Error", f"Export error: {str(e)}")
@@ -763,7 +848,7 @@ class SchedulerGUI:
                     filetypes=[("CSV Files", "*.csv")]
                 )
                 if filename:
-                    success = self.export_metrics_to_csv(self.last_scheduler.metrics, filename)
+                    success = self.export_metrics_to_csv(self.last_scheduler.run_metrics, filename)
                     if success:
                         messagebox.showinfo("Success", "Metrics exported successfully!")
                     else:
@@ -804,9 +889,10 @@ class SchedulerGUI:
                     ax1 = fig.add_subplot(211)
                     ax2 = fig.add_subplot(212)
                     
-                    # CPU Load plot
-                    config_ids = [f"Config {i}" for i in range(len(self.last_benchmark.comparison_data))]
-                    cpu_loads = [d['cpu_load'] for d in self.last_benchmark.comparison_data]
+                    # CPU Load plot (configurations a sweep pruned have no metrics)
+                    simulated = [d for d in self.last_benchmark.comparison_data if d['cpu_load'] is not None]
+                    config_ids = [f"Config {d['config_id']}" for d in simulated]
+                    cpu_loads = [d['cpu_load'] for d in simulated]
                     ax1.bar(config_ids, cpu_loads, color='skyblue')
                     ax1.set_title("CPU Utilization Comparison", fontsize=14)
                     ax1.set_ylabel("CPU Load", fontsize=12)
@@ -817,7 +903,7 @@ class SchedulerGUI:
                         ax1.text(i, v + 0.02, f"{v:.1%}", ha='center', fontsize=10)
                     
                     # Missed deadlines plot
-                    deadlines = [d['missed_deadlines'] for d in self.last_benchmark.comparison_data]
+                    deadlines = [d['missed_deadlines'] for d in simulated]
                     ax2.bar(config_ids, deadlines, color='lightcoral')
                     ax2.set_title("Missed Deadlines Comparison", fontsize=14)
                     ax2.set_ylabel("Count", fontsize=12)
@@ -856,7 +942,7 @@ class SchedulerGUI:
             if self.last_rtos:
                 filename = filedialog.asksaveasfilename(
                     defaultextension=".csv",
-                    filetypes=[("CSV Files", "*.csv")]
+                    filetypes=[("CSV Files", "*.csv"), ("Gzipped CSV Files", "*.csv.gz")]
                 )
                 if filename:
                     success = self.last_rtos.export_csv(filename)
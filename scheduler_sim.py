@@ -1,17 +1,64 @@
-import csv
+import pickle
+import zlib
+from contextlib import nullcontext
 from enum import Enum
+from time import perf_counter
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from itertools import cycle, islice
+from typing import Dict, List, Tuple, Union
+from release_calendar import ReleaseCalendar
+from steady_state import PeriodicTrace, hyperperiod
+from sim_trace import GanttTrace, IntSeries
+from sim_metrics import RunMetrics
+from trace_file import TraceWriter
+from trace_sink import CsvTraceSink, DiscardLog, StreamedGantt
+from run_stats import RunStats, instrument_scheduler
+from task_table import TaskTable
+from sched_policy import (DeadlineMonotonicPolicy, EDFPolicy, FixedPriorityPolicy, RateMonotonicPolicy,
+                          RoundRobinPolicy, SchedulingPolicy, TimeSlicedRoundRobinPolicy)
+
+# Bump whenever a change alters simulated results; cached results key on it
+SIMULATOR_VERSION = 1
+
+# Shortest span the event engine hands to a policy's event_step; ticking through a shorter
+# one inline is cheaper than syncing the scheduler state for the call
+_MIN_EVENT_STEP_SPAN = 8
 
 class SchedulerType(Enum):
     ROUND_ROBIN = "Round Robin"
     PRIORITY = "Priority"
+    EDF = "Earliest Deadline First"
+    RATE_MONOTONIC = "Rate Monotonic"
+    DEADLINE_MONOTONIC = "Deadline Monotonic"
 
 class SchedulingMode(Enum):
     PREEMPTIVE = "Preemptive"
     COOPERATIVE = "Cooperative"
 
-@dataclass
+class SimulationEngine(Enum):
+    TICK = "Tick"    # Advance one millisecond per loop iteration
+    EVENT = "Event"  # Jump straight to the next release, completion or preemption point
+
+def make_policy(s_type: SchedulerType, mode: SchedulingMode, quantum: int = 1):
+    """The sched_policy instance for a scheduler type and mode.
+    
+    quantum is the Round Robin slice length in ms and only applies to PREEMPTIVE mode;
+    cooperative Round Robin runs each job to completion whatever the quantum.
+    """
+    preemptive = mode == SchedulingMode.PREEMPTIVE
+    if s_type == SchedulerType.ROUND_ROBIN:
+        if preemptive and quantum > 1:
+            return TimeSlicedRoundRobinPolicy(quantum)
+        return RoundRobinPolicy(preemptive)
+    policy_class = {
+        SchedulerType.PRIORITY: FixedPriorityPolicy,
+        SchedulerType.EDF: EDFPolicy,
+        SchedulerType.RATE_MONOTONIC: RateMonotonicPolicy,
+        SchedulerType.DEADLINE_MONOTONIC: DeadlineMonotonicPolicy,
+    }[s_type]
+    return policy_class(preemptive)
+
+@dataclass(slots=True)
 class Task:
     name: str
     period_ms: int
@@ -22,135 +69,689 @@ class Task:
     remaining_exec: int = 0
     executions: List[Tuple[int, int]] = field(default_factory=list)
 
+def _append_interval(log: list, entry: tuple):
+    """Append a (..., start, end) interval, extending the last one if it continues it"""
+    if log:
+        last = log[-1]
+        if last[-1] == entry[-2] and last[:-2] == entry[:-2]:
+            log[-1] = last[:-1] + entry[-1:]
+            return
+    log.append(entry)
+
 class Scheduler:
-    def __init__(self, tasks: Dict[str, Task]):
-        self.tasks = tasks
+    def __init__(self, tasks: Union[Dict[str, Task], TaskTable], engine: SimulationEngine = SimulationEngine.TICK,
+                 raw_ticks: bool = False, steady_state: bool = False, trace_sink=None,
+                 instrument: bool = False, profiler=None, rr_quantum: int = 1):
+        # A shared TaskTable only provides parameters; the run state lives in fresh Task records
+        self.tasks = tasks.to_tasks() if isinstance(tasks, TaskTable) else tasks
+        self.engine = engine
+        # Raw mode logs one (name, t, t+1) entry per tick instead of merged intervals
+        self.raw_ticks = raw_ticks
+        # Stop simulating once the schedule repeats and extrapolate the rest of the run
+        self.steady_state = steady_state
+        # Receives finished gantt intervals (append/finish) instead of keeping them in gantt_log
+        self.trace_sink = trace_sink
+        if trace_sink is not None and steady_state:
+            raise ValueError("Skipped steady-state cycles cannot be streamed to a trace sink")
+        # Per-phase timers and switch counters in run_stats; costs nothing when off
+        self.instrument = instrument
+        self.run_stats = None
+        # Entered around each engine loop, e.g. a cProfile.Profile or a sampling profiler
+        self.profiler = profiler
+        # Preemptive Round Robin slice length in ms; 1 is the classic per-tick rotation
+        self.rr_quantum = rr_quantum
+        self.steady_state_cycle = None
+        self._cycle_marks = None
+        self._checkpoints = {}
+        self._checkpoint_time = None
+        self._next_checkpoint = None
+        self._hyperperiod = None
+        self.run_metrics = None
+        self.s_type = SchedulerType.PRIORITY
+        self.mode = SchedulingMode.PREEMPTIVE
+        self.policy = make_policy(self.s_type, self.mode, rr_quantum)
         self.current_time = 0
-        self.gantt_log = []
-        self.ready_queue = []
+        self.gantt_log = self._new_gantt_log()
+        self.ready_queue = self.policy.new_queue()
         self.current_task = None
         self.metrics = {
             'cpu_idle': 0,
             'cpu_busy': 0,
             'deadlines_missed': 0,
-            'task_jitter': {name: [] for name in tasks},
-            'buffer_state': []
+            'task_jitter': {name: IntSeries() for name in self.tasks},
+            'buffer_state': IntSeries()
         }
         # Initialize task states
         for task in self.tasks.values():
             task.remaining_exec = task.exec_ms
             task.next_release = 0
+        self.release_calendar = ReleaseCalendar(self.tasks.values())
+        if instrument:
+            instrument_scheduler(self)
 
     def reset(self):
         self.current_time = 0
-        self.gantt_log = []
-        self.ready_queue = []
+        self.gantt_log = self._new_gantt_log()
+        self.ready_queue = self.policy.new_queue()
         self.current_task = None
         self.metrics = {
             'cpu_idle': 0,
             'cpu_busy': 0,
             'deadlines_missed': 0,
-            'task_jitter': {name: [] for name in self.tasks},
-            'buffer_state': []
+            'task_jitter': {name: IntSeries() for name in self.tasks},
+            'buffer_state': IntSeries()
         }
         for task in self.tasks.values():
             task.next_release = 0
             task.deadline_missed = 0
             task.remaining_exec = task.exec_ms
-            task.executions = []
+            task.executions = DiscardLog() if self.trace_sink is not None else []
+        self.release_calendar = ReleaseCalendar(self.tasks.values())
+        self.run_metrics = None
+        self.steady_state_cycle = None
+        self._cycle_marks = None
+        self._checkpoints = {}
+        self._checkpoint_time = None
+        self._next_checkpoint = None
+        self._hyperperiod = None
+
+    def _new_gantt_log(self):
+        return StreamedGantt(self.trace_sink) if self.trace_sink is not None else GanttTrace()
 
     def _release_tasks(self):
-        for task in self.tasks.values():
-            if self.current_time >= task.next_release:
-                if task.next_release > 0:  # Not initial release
-                    if task.remaining_exec > 0:
-                        task.deadline_missed += 1
-                        self.metrics['deadlines_missed'] += 1
-                    
-                    # Calculate jitter
-                    jitter = abs((self.current_time - task.next_release) - task.period_ms)
-                    self.metrics['task_jitter'][task.name].append(jitter)
+        # Only the tasks due now are touched, in task order
+        for task in self.release_calendar.pop_due(self.current_time):
+            if task.next_release > 0:  # Not initial release
+                if task.remaining_exec > 0:
+                    task.deadline_missed += 1
+                    self.metrics['deadlines_missed'] += 1
                 
-                # Reset task state
-                task.remaining_exec = task.exec_ms
-                task.next_release = self.current_time + task.period_ms
-                if task not in self.ready_queue:
-                    self.ready_queue.append(task)
+                # Calculate jitter
+                jitter = abs((self.current_time - task.next_release) - task.period_ms)
+                self.metrics['task_jitter'][task.name].append(jitter)
+            
+            # Reset task state
+            task.remaining_exec = task.exec_ms
+            task.next_release = self.current_time + task.period_ms
+            self.release_calendar.push(task)
+            self.policy.on_release(self, task)
 
-    def run(self, duration: int, s_type: SchedulerType, mode: SchedulingMode):
-        self.reset()
-        print(f"Starting simulation for {duration}ms")
-        print(f"Tasks: {[t.name for t in self.tasks.values()]}")
+    def _select_task(self):
+        self.policy.pick_next(self)
+
+    def _log_slice(self, name: str, executions, start: int, end: int):
+        """Record that `name` held the CPU over [start, end) in the gantt log (and executions)"""
+        if self.raw_ticks:
+            ticks = [(start, end)] if start == end else [(t, t + 1) for t in range(start, end)]
+            if executions is not None:
+                executions.extend(ticks)
+            self.gantt_log.extend((name, s, e) for s, e in ticks)
+            return
         
-        # Initialize first releases
-        for task in self.tasks.values():
-            task.next_release = 0
+        # Empty slices carry no CPU time, so the compact trace drops them
+        if start == end:
+            return
+        # Intervals never cross a hyperperiod checkpoint, so whole cycles can be repeated
+        if start == self._checkpoint_time:
+            if executions is not None:
+                executions.append((start, end))
+            self.gantt_log.append((name, start, end))
+            return
+        if executions is not None:
+            _append_interval(executions, (start, end))
+        self.gantt_log.append_interval((name, start, end))
+
+    def _execute(self, ticks: int):
+        """Run the current task for `ticks` consecutive 1 ms slices (0 logs an empty slice)"""
+        task = self.current_task
+        start = self.current_time
+        self._log_slice(task.name, task.executions, start, start + ticks)
+        task.remaining_exec -= ticks
+        self.metrics['cpu_busy'] += ticks
+        self.current_time = start + ticks
+        self.policy.on_tick(self, ticks)
+
+    def _idle(self, ticks: int):
+        start = self.current_time
+        self._log_slice("IDLE", None, start, start + ticks)
+        self.metrics['cpu_idle'] += ticks
+        self.current_time = start + ticks
+
+    def _rotation_span(self, limit: int) -> int:
+        """Ticks of preemptive RR, at most `limit`, that only rotate the ready queue (no task leaves it)"""
+        n = len(self.ready_queue)
+        span = limit
+        # Task i can leave the queue no earlier than tick i, so later tasks cannot shorten the span
+        for i, task in enumerate(self.ready_queue):
+            if i >= span:
+                break
+            span = min(span, i + (task.remaining_exec - 1) * n)
+        return span
+
+    def _rotate(self, ticks: int):
+        """Apply `ticks` preemptive RR slices that keep every task in the ready queue"""
+        queue = list(self.ready_queue)
+        n = len(queue)
+        if n == 1:
+            self.current_task = queue[0]
+            self._execute(ticks)
+            return
+        
+        # Neighbouring slices belong to different tasks, so only the first can extend a logged one
+        start = self.current_time
+        order = islice(cycle(queue), ticks)
+        first = next(order)
+        self._log_slice(first.name, first.executions, start, start + 1)
+        for t, task in enumerate(order, start + 1):
+            task.executions.append((t, t + 1))
+            self.gantt_log.append((task.name, t, t + 1))
         
+        full, extra = divmod(ticks, n)
+        for i, task in enumerate(queue):
+            task.remaining_exec -= full + (1 if i < extra else 0)
+        
+        self.current_task = queue[(ticks - 1) % n]
+        self.ready_queue.rotate(extra)
+        self.metrics['cpu_busy'] += ticks
+        self.current_time = start + ticks
+
+    def _trace_marks(self) -> dict:
+        """Trace lengths and counters at the current time, used to measure one schedule cycle"""
+        return {
+            'gantt': len(self.gantt_log),
+            'buffer_state': len(self.metrics['buffer_state']),
+            'executions': {name: len(task.executions) for name, task in self.tasks.items()},
+            'task_jitter': {name: len(j) for name, j in self.metrics['task_jitter'].items()},
+            'task_missed': {name: task.deadline_missed for name, task in self.tasks.items()},
+            'cpu_idle': self.metrics['cpu_idle'],
+            'cpu_busy': self.metrics['cpu_busy'],
+            'deadlines_missed': self.metrics['deadlines_missed'],
+        }
+
+    def _steady_state_checkpoint(self, duration: int):
+        """At each hyperperiod boundary, skip ahead whole cycles once the full state recurs"""
+        now = self.current_time
+        self._checkpoint_time = now
+        self._next_checkpoint = now + self._hyperperiod
+        state = (
+            tuple((task.next_release - now, task.remaining_exec) for task in self.tasks.values()),
+            tuple(task.name for task in self.ready_queue),
+            self.current_task.name if self.current_task else None,
+            self.policy.state(),
+        )
+        marks = self._trace_marks()
+        if state not in self._checkpoints:
+            self._checkpoints[state] = (now, marks)
+            return
+        
+        cycle_start, start_marks = self._checkpoints[state]
+        cycle_ms = now - cycle_start
+        repeats = (duration - now) // cycle_ms
+        self._next_checkpoint = duration  # One skip is enough, the tail is shorter than a cycle
+        if repeats == 0:
+            return
+        
+        # Counters grow by the same amount every cycle
+        for key in ('cpu_idle', 'cpu_busy', 'deadlines_missed'):
+            self.metrics[key] += repeats * (marks[key] - start_marks[key])
+        for name, task in self.tasks.items():
+            task.deadline_missed += repeats * (marks['task_missed'][name] - start_marks['task_missed'][name])
+            task.next_release += repeats * cycle_ms
+        self.release_calendar = ReleaseCalendar(self.tasks.values())
+        self.current_time += repeats * cycle_ms
+        self.steady_state_cycle = (cycle_start, cycle_ms, repeats)
+        self._cycle_marks = (start_marks, marks)
+
+    def _expand_steady_state(self):
+        """Present the skipped cycles lazily in gantt_log, executions, buffer_state and jitter"""
+        cycle_start, cycle_ms, repeats = self.steady_state_cycle
+        start, stop = self._cycle_marks
+        self.gantt_log = PeriodicTrace(self.gantt_log, start['gantt'], stop['gantt'],
+                                       repeats, cycle_ms, time_fields=(1, 2))
+        self.metrics['buffer_state'] = PeriodicTrace(self.metrics['buffer_state'], start['buffer_state'],
+                                                     stop['buffer_state'], repeats, cycle_ms)
+        for name, task in self.tasks.items():
+            task.executions = PeriodicTrace(task.executions, start['executions'][name],
+                                            stop['executions'][name], repeats, cycle_ms, time_fields=(0, 1))
+            self.metrics['task_jitter'][name] = PeriodicTrace(
+                self.metrics['task_jitter'][name], start['task_jitter'][name],
+                stop['task_jitter'][name], repeats, cycle_ms)
+
+    def _run_tick(self, duration: int):
+        if self.instrument or self.raw_ticks:
+            self._run_tick_hooked(duration)
+        else:
+            self._run_inline(duration, jump=False)
+
+    def _run_inline(self, duration: int, jump: bool):
+        """The tick engine with its per-tick work kept inline; with jump, the event engine.
+        
+        Releases are only looked at when the calendar has one due, policy hooks the policy
+        does not override are not called, and a slice is logged once another task (or idle)
+        takes the CPU instead of every tick. With jump, idle gaps and cooperative runs up to
+        the next release or checkpoint are applied at once, and long preemptive spans go to
+        the policy's event_step; short ones are ticked through inline, which is cheaper.
+        Instrumented and raw_ticks runs use the hooked engines, whose per-phase methods they
+        wrap or need.
+        """
+        policy = self.policy
+        preemptive = policy.preemptive
+        pick_next = policy.pick_next
+        on_tick = policy.on_tick if type(policy).on_tick is not SchedulingPolicy.on_tick else None
+        on_complete = policy.on_complete if type(policy).on_complete is not SchedulingPolicy.on_complete else None
+        event_step = (policy.event_step if jump and preemptive
+                      and type(policy).event_step is not SchedulingPolicy.event_step else None)
+        max_queue = policy.event_step_max_queue if policy.event_step_max_queue is not None else len(self.tasks)
+        queue = self.ready_queue
+        log = self._log_slice
+        gantt_append = self.gantt_log.append
+        # Only the first slice of a segment can continue one already logged; once it went
+        # through _log_slice, every later one starts a new interval and is appended directly
+        direct = False
+        now = self.current_time
+        next_checkpoint = self._next_checkpoint
+        horizon = min(self.release_calendar.next_release(default=duration), next_checkpoint, duration)
+        busy = idle = 0
+        # Pending slice [run_start, now) of run_task (None: idle) and run-length buffer samples
+        run_task, run_start = None, now
+        sample, samples = 0, 0
+        
+        while now < duration:
+            if now >= horizon:
+                self.current_time = now
+                if now == next_checkpoint:
+                    # The checkpoint measures the traces and counters, so bring them up to date
+                    if now > run_start:
+                        log(run_task.name if run_task else "IDLE", run_task and run_task.executions, run_start, now)
+                    run_task, run_start = None, now
+                    direct = False
+                    self._flush_tick_counters(sample, samples, busy, idle)
+                    busy = idle = samples = 0
+                    self._steady_state_checkpoint(duration)
+                    now = run_start = self.current_time
+                    next_checkpoint = self._next_checkpoint
+                    horizon = min(self.release_calendar.next_release(default=duration), next_checkpoint, duration)
+                    continue
+                self._release_tasks()
+                horizon = min(self.release_calendar.next_release(default=duration), next_checkpoint, duration)
+            queued = len(queue)
+            if queued == sample:
+                samples += 1
+            else:
+                self.metrics['buffer_state'].append_repeat(sample, samples)
+                sample, samples = queued, 1
+            
+            # Handle task completion
+            task = self.current_task
+            if task is not None and task.remaining_exec <= 0:
+                if on_complete is not None:
+                    on_complete(self, task)
+                    queued = len(queue)
+                self.current_task = None
+            
+            # Nothing is released before the horizon, so the queue is stable until then
+            span = horizon - now if jump else 1
+            
+            # Scheduling decision
+            if not queued:
+                ticks = span if span > 1 else 1
+                idle += ticks
+                if ticks > 1:
+                    if sample == 0:
+                        samples += ticks - 1
+                    else:
+                        self.metrics['buffer_state'].append_repeat(sample, samples)
+                        sample, samples = 0, ticks - 1
+                if run_task is not None:
+                    # A task slice is never empty: run_task is only set once it ran
+                    if direct:
+                        gantt_append((run_task.name, run_start, now))
+                        run_task.executions.append((run_start, now))
+                    else:
+                        log(run_task.name, run_task.executions, run_start, now)
+                        direct = True
+                    run_task, run_start = None, now
+                now += ticks
+                continue
+            
+            if event_step is not None and span >= _MIN_EVENT_STEP_SPAN and queued <= max_queue:
+                # The policy applies the span through the scheduler's methods, on synced state
+                self.current_time = now
+                if now > run_start:
+                    log(run_task.name if run_task else "IDLE", run_task and run_task.executions, run_start, now)
+                self._flush_tick_counters(sample, samples, busy, idle)
+                busy = idle = samples = 0
+                event_step(self, span, sample)
+                now = run_start = self.current_time
+                run_task = None
+                direct = False
+                continue
+            
+            pick_next(self)
+            task = self.current_task
+            ticks = task.remaining_exec
+            if span > 1 and not preemptive:
+                # A cooperative task keeps the CPU until it completes, unless picking it
+                # emptied the queue: the next tick then idles even though the task has work
+                queued = len(queue)
+                limit = span if queued else 1
+            else:
+                limit = 1
+            if ticks > limit:
+                ticks = limit
+            task.remaining_exec -= ticks
+            busy += ticks
+            if ticks > 0:
+                if ticks > 1:
+                    if queued == sample:
+                        samples += ticks - 1
+                    else:
+                        self.metrics['buffer_state'].append_repeat(sample, samples)
+                        sample, samples = queued, ticks - 1
+                if task is not run_task:
+                    if now > run_start:
+                        if direct:
+                            if run_task is None:
+                                gantt_append(("IDLE", run_start, now))
+                            else:
+                                gantt_append((run_task.name, run_start, now))
+                                run_task.executions.append((run_start, now))
+                        else:
+                            log(run_task.name if run_task else "IDLE", run_task and run_task.executions,
+                                run_start, now)
+                            direct = True
+                    run_task, run_start = task, now
+                now += ticks
+            if on_tick is not None:
+                self.current_time = now
+                on_tick(self, ticks)
+        
+        self.current_time = now
+        if now > run_start:
+            log(run_task.name if run_task else "IDLE", run_task and run_task.executions, run_start, now)
+        self._flush_tick_counters(sample, samples, busy, idle)
+
+    def _flush_tick_counters(self, sample: int, samples: int, busy: int, idle: int):
+        """Add _run_tick's pending buffer samples and CPU time to the metrics"""
+        self.metrics['buffer_state'].append_repeat(sample, samples)
+        self.metrics['cpu_busy'] += busy
+        self.metrics['cpu_idle'] += idle
+
+    def _run_tick_hooked(self, duration: int):
+        """The tick engine through _release_tasks, _select_task, _execute and _idle"""
         while self.current_time < duration:
+            if self.current_time == self._next_checkpoint:
+                self._steady_state_checkpoint(duration)
+                continue
             self._release_tasks()
             self.metrics['buffer_state'].append(len(self.ready_queue))
             
             # Handle task completion
             if self.current_task and self.current_task.remaining_exec <= 0:
+                self.policy.on_complete(self, self.current_task)
                 self.current_task = None
             
             # Scheduling decision
             if not self.ready_queue:
-                self.metrics['cpu_idle'] += 1
-                self.gantt_log.append(("IDLE", self.current_time, self.current_time + 1))
-                self.current_time += 1
+                self._idle(1)
                 continue
             
-            if s_type == SchedulerType.ROUND_ROBIN:
-                if mode == SchedulingMode.PREEMPTIVE or not self.current_task:
-                    self.current_task = self.ready_queue.pop(0)
-                    # For RR, put back at the end if not finished
-                    if self.current_task.remaining_exec > 1:
-                        self.ready_queue.append(self.current_task)
-            else:  # Priority
-                if mode == SchedulingMode.PREEMPTIVE or not self.current_task:
-                    # Find highest priority task (lowest number)
-                    self.ready_queue.sort(key=lambda t: t.priority)
-                    self.current_task = self.ready_queue.pop(0)
+            self._select_task()
             
             # Execute current task
-            exec_slice = min(1, self.current_task.remaining_exec)
-            start = self.current_time
-            end = start + exec_slice
+            self._execute(min(1, self.current_task.remaining_exec))
+
+    def _run_event(self, duration: int):
+        if self.instrument or self.raw_ticks:
+            self._run_event_hooked(duration)
+        else:
+            self._run_inline(duration, jump=True)
+
+    def _run_event_hooked(self, duration: int):
+        """Same decisions as _run_tick, but spans without a scheduling event are applied at once"""
+        buffer_state = self.metrics['buffer_state']
+        policy = self.policy
+        queue = self.ready_queue
+        while self.current_time < duration:
+            now = self.current_time
+            if now == self._next_checkpoint:
+                self._steady_state_checkpoint(duration)
+                continue
+            # Nothing is released before the next release time, so the queue is stable until then
+            next_release = self.release_calendar.next_release(default=duration)
+            if next_release <= now:
+                self._release_tasks()
+                next_release = self.release_calendar.next_release(default=duration)
+            queued = len(queue)
+            buffer_state.append(queued)
+            
+            # Handle task completion
+            task = self.current_task
+            if task and task.remaining_exec <= 0:
+                policy.on_complete(self, task)
+                self.current_task = task = None
+            
+            span = max(min(next_release, duration, self._next_checkpoint) - now, 1)
             
-            self.current_task.executions.append((start, end))
-            self.current_task.remaining_exec -= exec_slice
-            self.gantt_log.append((self.current_task.name, start, end))
-            self.metrics['cpu_busy'] += exec_slice
-            self.current_time = end
+            if not queue:
+                buffer_state.append_repeat(0, span - 1)
+                self._idle(span)
+                continue
+            
+            # A cooperative task keeps the CPU until it completes, from the tick it is picked on,
+            # unless picking it empties the queue: the tick engine then idles on the next tick
+            if not policy.preemptive:
+                if task is None:
+                    self._select_task()
+                    task = self.current_task
+                    queued = len(queue)
+                    if not queued:
+                        span = 1
+                span = min(span, task.remaining_exec)
+                buffer_state.append_repeat(queued, span - 1)
+                self._execute(span)
+                continue
+            
+            policy.event_step(self, span, queued)
+
+    def start(self, s_type: SchedulerType, mode: SchedulingMode):
+        """Reset to t=0 with the given policy; follow with run_until()"""
+        self.reset()
+        self.s_type = s_type
+        self.mode = mode
+        
+        # Initialize first releases
+        for task in self.tasks.values():
+            task.next_release = 0
+        
+        # The policy decides the ready queue structure
+        self.policy = make_policy(s_type, mode, self.rr_quantum)
+        self.ready_queue = self.policy.new_queue()
+        
+        self._hyperperiod = hyperperiod(self.tasks.values()) if self.steady_state else None
+        self.run_stats = RunStats() if self.instrument else None
+
+    def _materialize_traces(self):
+        """Turn steady-state views back into growable traces so the run can continue"""
+        if isinstance(self.gantt_log, PeriodicTrace):
+            self.gantt_log = GanttTrace(self.gantt_log)
+            self.metrics['buffer_state'] = IntSeries(self.metrics['buffer_state'])
+            for name, task in self.tasks.items():
+                task.executions = list(task.executions)
+                self.metrics['task_jitter'][name] = IntSeries(self.metrics['task_jitter'][name])
+            # Checkpoint marks index the old traces
+            self._checkpoints = {}
+            self.steady_state_cycle = None
+        
+        # Views handed out by the previous RunMetrics must not block new appends
+        self.run_metrics = None
+        self.gantt_log.unpin()
+        self.metrics['buffer_state'].unpin()
+        for jitters in self.metrics['task_jitter'].values():
+            jitters.unpin()
+
+    def run_until(self, end_time: int):
+        """Continue the simulation from the current state up to `end_time`"""
+        self._materialize_traces()
+        
+        # Checkpoints start one hyperperiod in, once every task has been released at least once
+        if self._hyperperiod:
+            self._next_checkpoint = max(-(-self.current_time // self._hyperperiod), 1) * self._hyperperiod
+        else:
+            self._next_checkpoint = end_time
+        
+        started = perf_counter()
+        with self.profiler if self.profiler is not None else nullcontext():
+            if self.engine == SimulationEngine.EVENT:
+                self._run_event(end_time)
+            else:
+                self._run_tick(end_time)
+        if self.run_stats is not None:
+            self._update_run_stats(perf_counter() - started)
+        
+        if self.steady_state_cycle:
+            self._expand_steady_state()
         
         # Calculate final metrics
         total_time = self.metrics['cpu_idle'] + self.metrics['cpu_busy']
         self.metrics['cpu_load'] = self.metrics['cpu_busy'] / total_time if total_time else 0
+        self.run_metrics = RunMetrics(self.tasks, self.gantt_log, self.metrics, self.current_time)
+        return self.gantt_log, self.metrics
+
+    def _update_run_stats(self, elapsed: float):
+        """Add a segment's wall time and derive the counters the trace already holds"""
+        stats = self.run_stats
+        stats.wall_seconds += elapsed
+        stats.phase_seconds['other'] = stats.wall_seconds - stats._accounted
+        # One buffer sample per simulated ms (not per loop iteration); steady-state views are
+        # not expanded yet, so skipped cycles are left out
+        buffer_state = self.metrics['buffer_state']
+        stats.simulated_ms = len(buffer_state)
+        stats.queue_high_water = max(int(buffer_state.values.max(initial=0)), stats.queue_high_water)
+        # Every release after a task's first one records a jitter sample
+        initial = len(self.tasks) if stats.simulated_ms else 0
+        stats.releases = initial + sum(len(jitters) for jitters in self.metrics['task_jitter'].values())
+
+    def run(self, duration: int, s_type: SchedulerType, mode: SchedulingMode):
+        print(f"Starting simulation for {duration}ms")
+        print(f"Tasks: {[t.name for t in self.tasks.values()]}")
+        
+        self.start(s_type, mode)
+        self.run_until(duration)
+        self.finish_trace()
         
         print(f"Simulation complete! CPU Load: {self.metrics['cpu_load']:.2%}")
         return self.gantt_log, self.metrics
 
+    def run_steps(self, duration: int, s_type: SchedulerType, mode: SchedulingMode, steps: int = 100):
+        """Run like run() in `steps` segments, yielding the simulated time after each.
+        
+        Stopping the iteration early cancels the run, leaving the state at the last segment.
+        """
+        self.start(s_type, mode)
+        step = max(-(-duration // steps), 1)
+        for end in list(range(step, duration, step)) + [duration]:
+            self.run_until(end)
+            yield self.current_time
+        self.finish_trace()
+
+    def finish_trace(self):
+        """Hand the last interval to the trace sink and let it write its closing sections"""
+        if self.trace_sink is not None:
+            self.gantt_log.flush()
+            self.trace_sink.finish(self)
+
+    def snapshot(self, include_trace: bool = True) -> bytes:
+        """Serialize the full simulation state (zlib-compressed pickle) for from_snapshot().
+        
+        Without include_trace only the last gantt interval and execution of each task are
+        kept, so a resumed segment still merges with it; jitter and buffer samples restart.
+        Only load snapshots you created yourself, as with any pickle.
+        """
+        tail = slice(None) if include_trace else slice(-1, None)
+        state = {
+            'options': {'engine': self.engine, 'raw_ticks': self.raw_ticks,
+                        'steady_state': self.steady_state, 'rr_quantum': self.rr_quantum},
+            's_type': self.s_type,
+            'mode': self.mode,
+            'policy': self.policy,
+            'current_time': self.current_time,
+            'tasks': [(t.name, t.period_ms, t.exec_ms, t.priority, t.next_release,
+                       t.deadline_missed, t.remaining_exec, list(t.executions[tail]))
+                      for t in self.tasks.values()],
+            'ready_queue': [t.name for t in self.ready_queue],
+            'current_task': self.current_task.name if self.current_task else None,
+            'counters': {key: self.metrics[key] for key in ('cpu_idle', 'cpu_busy', 'deadlines_missed')},
+            'gantt': list(self.gantt_log[tail]),
+            'buffer_state': list(self.metrics['buffer_state']) if include_trace else [],
+            'task_jitter': {name: list(j) if include_trace else []
+                            for name, j in self.metrics['task_jitter'].items()},
+        }
+        return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @classmethod
+    def from_snapshot(cls, data: bytes):
+        """Rebuild a scheduler from snapshot() output, ready for run_until()"""
+        state = pickle.loads(zlib.decompress(data))
+        tasks = {row[0]: Task(*row[:4]) for row in state['tasks']}
+        scheduler = cls(tasks, **state['options'])
+        # The constructor resets task state, so restore it afterwards
+        for name, _, _, _, next_release, missed, remaining, executions in state['tasks']:
+            task = tasks[name]
+            task.next_release = next_release
+            task.deadline_missed = missed
+            task.remaining_exec = remaining
+            task.executions = executions
+        
+        scheduler.s_type = state['s_type']
+        scheduler.mode = state['mode']
+        scheduler.current_time = state['current_time']
+        scheduler.policy = state['policy']
+        scheduler.ready_queue = scheduler.policy.new_queue()
+        # Pushing in pop order preserves the FIFO order among equal priorities
+        for name in state['ready_queue']:
+            scheduler.ready_queue.push(tasks[name])
+        scheduler.current_task = tasks.get(state['current_task'])
+        scheduler.release_calendar = ReleaseCalendar(tasks.values())
+        scheduler._hyperperiod = hyperperiod(tasks.values()) if scheduler.steady_state else None
+        
+        scheduler.metrics.update(state['counters'])
+        scheduler.metrics['buffer_state'] = IntSeries(state['buffer_state'])
+        scheduler.metrics['task_jitter'] = {name: IntSeries(j) for name, j in state['task_jitter'].items()}
+        scheduler.gantt_log = GanttTrace(state['gantt'])
+        return scheduler
+
     def export_csv(self, filename: str):
+        """Write the gantt log and metrics as CSV (gzip-compressed for *.gz filenames)"""
         try:
-            with open(filename, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(["Task", "Start", "End"])
-                writer.writerows(self.gantt_log)
-                
-                writer.writerow([])
-                writer.writerow(["Metric", "Value"])
-                writer.writerow(["CPU Load", f"{self.metrics['cpu_load']:.2%}"])
-                writer.writerow(["Idle Time", f"{self.metrics['cpu_idle']} ms"])
-                writer.writerow(["Busy Time", f"{self.metrics['cpu_busy']} ms"])
-                writer.writerow(["Missed Deadlines", self.metrics['deadlines_missed']])
-                
-                writer.writerow([])
-                writer.writerow(["Task", "Deadlines Missed", "Avg Jitter (ms)"])
-                for name, task in self.tasks.items():
-                    jitters = self.metrics['task_jitter'][name]
-                    avg_jitter = sum(jitters)/len(jitters) if jitters else 0
-                    writer.writerow([name, task.deadline_missed, f"{avg_jitter:.2f}"])
+            sink = CsvTraceSink(filename)
+            sink.extend(self.gantt_log)
+            sink.finish(self)
+            return True
+        except Exception as e:
+            print(f"Export error: {str(e)}")
+            return False
+
+    def write_csv_summary(self, writer):
+        """The metrics and per-task sections that follow the gantt rows in a CSV export"""
+        writer.writerow([])
+        writer.writerow(["Metric", "Value"])
+        writer.writerow(["CPU Load", f"{self.metrics['cpu_load']:.2%}"])
+        writer.writerow(["Idle Time", f"{self.metrics['cpu_idle']} ms"])
+        writer.writerow(["Busy Time", f"{self.metrics['cpu_busy']} ms"])
+        writer.writerow(["Missed Deadlines", self.metrics['deadlines_missed']])
+        
+        writer.writerow([])
+        writer.writerow(["Task", "Deadlines Missed", "Avg Jitter (ms)"])
+        for name, task in self.tasks.items():
+            avg_jitter = self.run_metrics.avg_jitter(name)
+            writer.writerow([name, task.deadline_missed, f"{avg_jitter:.2f}"])
+
+    def export_trace(self, filename: str, block_size: int = 4096):
+        """Write the gantt log as a compact binary trace, read back with trace_file.TraceReader"""
+        try:
+            with TraceWriter(filename, block_size) as writer:
+                writer.extend(self.gantt_log)
             return True
         except Exception as e:
             print(f"Export error: {str(e)}")
@@ -158,8 +759,11 @@ class Scheduler:
 
 # FreeRTOS compatibility layer
 class FreeRTOSScheduler(Scheduler):
-    def __init__(self, tasks: Dict[str, Task]):
-        super().__init__(tasks)
+    # FreeRTOS runs the highest-priority ready task and preempts on every tick
+    POLICY = (SchedulerType.PRIORITY, SchedulingMode.PREEMPTIVE)
+    
+    def __init__(self, tasks: Union[Dict[str, Task], TaskTable], **options):
+        super().__init__(tasks, **options)
         # FreeRTOS-specific parameters
         self.tick_rate_hz = 1000  # 1ms tick rate
     
@@ -167,4 +771,13 @@ class FreeRTOSScheduler(Scheduler):
         self.tasks[name] = Task(name, period, exec_time, priority)
     
     def run_rtos_simulation(self, duration):
-        return self.run(duration, SchedulerType.PRIORITY, SchedulingMode.PREEMPTIVE)
\ No newline at end of file
+        return self.run(duration, *self.POLICY)
+    
+    def run_rtos_steps(self, duration, steps=100):
+        return self.run_steps(duration, *self.POLICY, steps)
+
+if __name__ == "__main__":
+    # Headless entry point: python -m scheduler_sim run|bench|sweep|montecarlo (see sim_cli)
+    import sys
+    from sim_cli import main
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Headless command-line runner: python -m scheduler_sim run|bench|sweep|montecarlo ...
+
+Task files hold {name: {"period_ms", "exec_ms", "priority"}} like TaskManager.get_task_dict();
+variation files hold the list the Benchmarking tab takes. Only the simulator core is imported,
+so nothing pulls in tkinter, matplotlib or pandas.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import sys
+from scheduler_sim import Scheduler, SchedulerType, SchedulingMode, SimulationEngine
+from task_table import TaskTable
+from trace_sink import CsvTraceSink
+
+def load_json(path):
+    if path == "-":
+        return json.load(sys.stdin)
+    with open(path) as f:
+        return json.load(f)
+
+def build_tasks(task_params):
+    return TaskTable(task_params).to_tasks()
+
+@contextlib.contextmanager
+def _output(path):
+    if not path or path == "-":
+        yield sys.stdout
+    else:
+        with open(path, "w", newline="") as f:
+            yield f
+
+def write_rows(rows, out, fmt):
+    """Write comparison rows as a JSON list or as CSV with the union of their columns"""
+    if fmt == "json":
+        json.dump(rows, out, indent=2)
+        out.write("\n")
+        return
+    fields = list(dict.fromkeys(key for row in rows for key in row))
+    writer = csv.DictWriter(out, fieldnames=fields, restval="")
+    writer.writeheader()
+    writer.writerows(rows)
+
+def cmd_run(args):
+    # The trace is streamed to --trace while simulating, unless skipped cycles must be expanded
+    sink = CsvTraceSink(args.trace) if args.trace and not args.steady_state else None
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+    scheduler = Scheduler(build_tasks(load_json(args.tasks)), engine=SimulationEngine[args.engine],
+                          steady_state=args.steady_state, trace_sink=sink, instrument=args.stats,
+                          profiler=profiler, rr_quantum=args.quantum or 1)
+    scheduler.start(SchedulerType[args.sched_type], SchedulingMode[args.mode])
+    scheduler.run_until(args.duration)
+    scheduler.finish_trace()
+    if args.trace and sink is None:
+        scheduler.export_csv(args.trace)
+    if profiler:
+        profiler.dump_stats(args.profile)
+    
+    # Response times are derived from the trace, which a streamed run does not keep
+    result = scheduler.run_metrics.summary(include_response=sink is None)
+    if scheduler.run_stats:
+        result["run_stats"] = scheduler.run_stats.summary()
+    with _output(args.output) as out:
+        json.dump(result, out, indent=2)
+        out.write("\n")
+
+def cmd_bench(args):
+    from benchmark_simulator import BenchmarkSimulator
+
+    base_tasks = load_json(args.tasks)
+    variations = load_json(args.variations)
+    benchmark = BenchmarkSimulator()
+    # Scheduler.run reports progress with print(); keep stdout for the results
+    with contextlib.redirect_stdout(sys.stderr):
+        benchmark.run_batch(base_tasks, variations, args.duration, workers=args.workers,
+                            chunksize=args.chunksize, precheck=args.precheck, lockstep=args.lockstep)
+    fmt = args.format or ("csv" if args.output and args.output.endswith(".csv") else "json")
+    with _output(args.output) as out:
+        write_rows(benchmark.comparison_data, out, fmt)
+
+def cmd_sweep(args):
+    from design_sweep import spec_variations, sweep, sweep_columns
+    
+    base_tasks = load_json(args.tasks)
+    rows = sweep(base_tasks, spec_variations(load_json(args.spec)), args.duration, dedup=not args.no_dedup,
+                 prune=not args.no_prune, batch_size=args.batch_size, precheck=args.precheck)
+    fmt = args.format or ("csv" if args.output and args.output.endswith(".csv") else "jsonl")
+    # Rows are written as they come; progress prints go to stderr
+    with _output(args.output) as out, contextlib.redirect_stdout(sys.stderr):
+        if fmt == "csv":
+            writer = csv.DictWriter(out, fieldnames=sweep_columns(base_tasks, args.precheck), restval="")
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                out.write(json.dumps(row) + "\n")
+
+def cmd_montecarlo(args):
+    from monte_carlo import distribution_from_spec, monte_carlo
+    
+    # Task entries may add "exec_dist" and "release_jitter" (see distribution_from_spec)
+    task_params = load_json(args.tasks)
+    exec_dist = {name: distribution_from_spec(params["exec_dist"])
+                 for name, params in task_params.items() if "exec_dist" in params}
+    release_jitter = {name: distribution_from_spec(params["release_jitter"])
+                      for name, params in task_params.items() if "release_jitter" in params}
+    result = monte_carlo(build_tasks(task_params), SchedulerType[args.sched_type], SchedulingMode[args.mode],
+                         args.duration, args.replications, exec_dist, release_jitter, seed=args.seed,
+                         batch_size=args.batch_size, workers=args.workers)
+    with _output(args.output) as out:
+        json.dump(result.summary(args.confidence), out, indent=2)
+        out.write("\n")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m scheduler_sim",
+                                     description="Run scheduler simulations without the GUI")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="simulate one task set and print its metrics as JSON")
+    run.add_argument("tasks", help="task set JSON file ('-' for stdin)")
+    run.add_argument("--duration", type=int, default=100)
+    run.add_argument("--sched-type", choices=[s.name for s in SchedulerType], default="PRIORITY")
+    run.add_argument("--mode", choices=[m.name for m in SchedulingMode], default="PREEMPTIVE")
+    run.add_argument("--engine", choices=[e.name for e in SimulationEngine], default="TICK")
+    run.add_argument("--quantum", type=int, help="preemptive Round Robin slice length in ms (default 1)")
+    run.add_argument("--steady-state", action="store_true", help="extrapolate once the schedule repeats")
+    run.add_argument("--trace", help="also write the gantt trace and metrics CSV here (*.gz: gzipped)")
+    run.add_argument("--stats", action="store_true", help="add per-phase timings and switch counters")
+    run.add_argument("--profile", help="write cProfile stats of the simulation loop to this file")
+    run.add_argument("-o", "--output", help="metrics file (default stdout)")
+    run.set_defaults(handler=cmd_run)
+
+    bench = commands.add_parser("bench", help="run a batch of variations and print the comparison rows")
+    bench.add_argument("tasks", help="base task set JSON file")
+    bench.add_argument("variations", help="variations JSON file (a list of variation dicts)")
+    bench.add_argument("--duration", type=int, default=200)
+    bench.add_argument("--workers", type=int, default=1, help="process pool size, 0 for every core")
+    bench.add_argument("--chunksize", type=int, default=1)
+    bench.add_argument("--lockstep", action="store_true", help="simulate all variations together in NumPy")
+    bench.add_argument("--precheck", choices=["flag", "skip"],
+                       help="skip also leaves out EDF/RM/DM runs the analysis settles")
+    bench.add_argument("--format", choices=["json", "csv"], help="default: csv for *.csv outputs, else json")
+    bench.add_argument("-o", "--output", help="results file (default stdout)")
+    bench.set_defaults(handler=cmd_bench)
+    
+    sweep = commands.add_parser("sweep", help="explore a parameter grid or random sample, streaming rows")
+    sweep.add_argument("tasks", help="base task set JSON file")
+    sweep.add_argument("spec", help="sweep spec JSON file (see design_sweep)")
+    sweep.add_argument("--duration", type=int, default=200)
+    sweep.add_argument("--batch-size", type=int, default=1, help="simulate this many at once in NumPy")
+    sweep.add_argument("--no-dedup", action="store_true", help="simulate equivalent configurations too")
+    sweep.add_argument("--no-prune", action="store_true", help="simulate dominated configurations too")
+    sweep.add_argument("--precheck", choices=["flag", "skip"],
+                       help="skip also leaves out EDF/RM/DM runs the analysis settles")
+    sweep.add_argument("--format", choices=["jsonl", "csv"], help="default: csv for *.csv outputs, else jsonl")
+    sweep.add_argument("-o", "--output", help="results file (default stdout)")
+    sweep.set_defaults(handler=cmd_sweep)
+    
+    mc = commands.add_parser("montecarlo", help="replicate a run with random execution times and release jitter")
+    mc.add_argument("tasks", help="task set JSON file, entries may add exec_dist / release_jitter")
+    mc.add_argument("--duration", type=int, default=1000)
+    mc.add_argument("--sched-type", choices=[s.name for s in SchedulerType], default="PRIORITY")
+    mc.add_argument("--mode", choices=[m.name for m in SchedulingMode], default="PREEMPTIVE")
+    mc.add_argument("--replications", type=int, default=1000)
+    mc.add_argument("--seed", type=int, default=0)
+    mc.add_argument("--confidence", type=float, default=0.95)
+    mc.add_argument("--batch-size", type=int, default=1000, help="replications simulated together in NumPy")
+    mc.add_argument("--workers", type=int, default=1, help="process pool size, 0 for every core")
+    mc.add_argument("-o", "--output", help="summary file (default stdout)")
+    mc.set_defaults(handler=cmd_montecarlo)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "quantum", None) is not None:
+        # Only Round Robin has slices, and cooperative Round Robin runs each job to completion
+        if args.sched_type != "ROUND_ROBIN":
+            parser.error("--quantum only applies to --sched-type ROUND_ROBIN")
+        if args.mode != "PREEMPTIVE":
+            parser.error("--quantum only applies to --mode PREEMPTIVE")
+        if args.quantum < 1:
+            parser.error("--quantum must be at least 1 ms")
+    if getattr(args, "workers", 1) == 0:
+        args.workers = None
+    args.handler(args)
+    return 0
@@ -0,0 +1,145 @@
+from functools import cached_property
+import numpy as np
+from sim_trace import gantt_columns
+
+def as_array(values):
+    """int64 array for an IntSeries (zero-copy), list or lazy trace"""
+    if hasattr(values, 'values'):
+        return values.values
+    return np.fromiter(values, dtype=np.int64, count=len(values))
+
+class RunMetrics:
+    """Metrics derived from one finished run, computed with NumPy on first use and cached.
+
+    Built by Scheduler.run as `scheduler.run_metrics`; everything reads the run's trace and
+    metrics dict, so a new run gets a new instance.
+    """
+    def __init__(self, tasks, gantt_log, metrics, duration: int):
+        self.tasks = tasks
+        self.gantt_log = gantt_log
+        self.metrics = metrics
+        self.duration = duration
+
+    @cached_property
+    def _columns(self):
+        return gantt_columns(self.gantt_log)
+
+    @cached_property
+    def buffer_values(self):
+        return as_array(self.metrics['buffer_state'])
+
+    @cached_property
+    def buffer_average(self) -> float:
+        values = self.buffer_values
+        return float(values.mean()) if len(values) else 0.0
+
+    @cached_property
+    def buffer_histogram(self):
+        """Number of scheduler iterations that saw 0, 1, 2, ... tasks in the ready queue"""
+        return np.bincount(self.buffer_values)
+
+    @cached_property
+    def jitter_stats(self):
+        """Per-task jitter {'count', 'mean', 'max', 'std'}, zeros for tasks never re-released"""
+        stats = {}
+        for name, jitters in self.metrics['task_jitter'].items():
+            values = as_array(jitters)
+            if len(values):
+                stats[name] = {'count': len(values), 'mean': float(values.mean()),
+                               'max': int(values.max()), 'std': float(values.std())}
+            else:
+                stats[name] = {'count': 0, 'mean': 0.0, 'max': 0, 'std': 0.0}
+        return stats
+
+    def avg_jitter(self, name: str) -> float:
+        return self.jitter_stats[name]['mean']
+
+    def summary(self, include_response: bool = True) -> dict:
+        """Plain-data run summary (JSON/pickle ready); response times need the gantt trace"""
+        tasks = {}
+        for name, task in self.tasks.items():
+            tasks[name] = {'deadlines_missed': task.deadline_missed, 'avg_jitter': self.avg_jitter(name)}
+            if include_response:
+                tasks[name]['max_response'] = self.response_stats[name]['max']
+        return {
+            'cpu_load': self.metrics['cpu_load'],
+            'cpu_idle': self.metrics['cpu_idle'],
+            'cpu_busy': self.metrics['cpu_busy'],
+            'deadlines_missed': self.metrics['deadlines_missed'],
+            'buffer_average': self.buffer_average,
+            'tasks': tasks,
+        }
+
+    def _intervals(self, name: str):
+        names, task_ids, starts, ends = self._columns
+        if name not in names:
+            return starts[:0], ends[:0]
+        mask = task_ids == names.index(name)
+        return starts[mask], ends[mask]
+
+    @cached_property
+    def response_times(self):
+        """Per-task response time of every job that completed within its own period.
+
+        Job j is released at j * period_ms and its remaining time resets at the next release,
+        so it completes once the task has run exec_ms inside [j * period, (j + 1) * period).
+        """
+        result = {}
+        for name, task in self.tasks.items():
+            if task.period_ms <= 0:
+                result[name] = np.empty(0, dtype=np.int64)
+                continue
+            releases = np.arange(0, self.duration, task.period_ms, dtype=np.int64)
+            if task.exec_ms <= 0:
+                result[name] = np.zeros(len(releases), dtype=np.int64)
+                continue
+
+            starts, ends = self._intervals(name)
+            executed = np.cumsum(ends - starts)
+            before = np.concatenate(([0], executed[:-1]))
+
+            def executed_by(times):
+                # CPU time the task received before each of `times`
+                if not len(starts):
+                    return np.zeros_like(times)
+                idx = np.searchsorted(starts, times, side='right') - 1
+                clipped = np.maximum(idx, 0)
+                inside = np.clip(times - starts[clipped], 0, ends[clipped] - starts[clipped])
+                return np.where(idx >= 0, before[clipped] + inside, 0)
+
+            window_end = np.minimum(releases + task.period_ms, self.duration)
+            target = executed_by(releases) + task.exec_ms
+            done = executed_by(window_end) >= target
+            idx = np.searchsorted(executed, target[done], side='left')
+            completion = ends[idx] - (executed[idx] - target[done])
+            result[name] = completion - releases[done]
+        return result
+
+    @cached_property
+    def response_stats(self):
+        """Per-task response time {'jobs', 'mean', 'max'} over completed jobs"""
+        stats = {}
+        for name, times in self.response_times.items():
+            stats[name] = {'jobs': len(times),
+                           'mean': float(times.mean()) if len(times) else 0.0,
+                           'max': int(times.max()) if len(times) else 0}
+        return stats
+
+    @cached_property
+    def spans(self):
+        """{'busy': (starts, ends), 'idle': (starts, ends)} of maximal busy and idle stretches"""
+        names, task_ids, starts, ends = self._columns
+        keep = ends > starts
+        task_ids, starts, ends = task_ids[keep], starts[keep], ends[keep]
+        idle = task_ids == names.index("IDLE") if "IDLE" in names else np.zeros(len(task_ids), dtype=bool)
+
+        # A new span starts wherever busy/idle flips or the trace has a gap
+        first = np.ones(len(starts), dtype=bool)
+        first[1:] = (idle[1:] != idle[:-1]) | (starts[1:] != ends[:-1])
+        heads = np.flatnonzero(first)
+        tails = np.append(heads[1:], len(starts))[:len(heads)] - 1
+        span_idle = idle[heads]
+        return {
+            'busy': (starts[heads][~span_idle], ends[tails][~span_idle]),
+            'idle': (starts[heads][span_idle], ends[tails][span_idle]),
+        }
@@ -0,0 +1,143 @@
+from array import array
+import numpy as np
+
+# Columns are stored in array.array buffers: appends from the simulation loop stay cheap
+# (no per-element NumPy scalar conversion) and NumPy reads them through zero-copy views.
+# A buffer cannot grow while a view of it is alive, so take views once the run is over
+# (unpin() swaps in a private copy before a resumed run appends again).
+
+def _unpinned(buffer):
+    """`buffer` itself if it can grow, otherwise a copy free of the NumPy views pinning it"""
+    try:
+        buffer.append(0)
+    except BufferError:
+        return array(buffer.typecode, buffer)
+    buffer.pop()
+    return buffer
+
+class IntSeries:
+    """Growable int64 column (buffer_state, task jitter) that iterates like a list of ints"""
+    def __init__(self, values=()):
+        self._data = array('q', values)
+
+    @property
+    def values(self):
+        """Zero-copy NumPy view of the stored values"""
+        return np.frombuffer(self._data, dtype=np.int64)
+
+    def append(self, value: int):
+        self._data.append(value)
+
+    def unpin(self):
+        """Make sure appends work again even if views from `values` are still alive"""
+        self._data = _unpinned(self._data)
+
+    def append_repeat(self, value: int, count: int):
+        """Append `value` `count` times"""
+        if count > 0:
+            self._data.extend(array('q', [value]) * count)
+
+    def extend(self, values):
+        self._data.extend(values)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._data[index].tolist()
+        return self._data[index]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"IntSeries({self._data.tolist()!r})"
+
+class GanttTrace:
+    """Columnar gantt log: task id (index into `names`), start and end columns.
+
+    Iterating or indexing yields (name, start, end) tuples, so code written for the old list
+    of tuples keeps working; plotting and pandas code should use the column views instead.
+    """
+    def __init__(self, entries=()):
+        self.names = []
+        self._ids = {}
+        self._task = array('h')
+        self._start = array('q')
+        self._end = array('q')
+        self.extend(entries)
+
+    def task_id(self, name: str) -> int:
+        """Id of `name` in the name table, adding it on first use"""
+        task_id = self._ids.get(name)
+        if task_id is None:
+            task_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+            if task_id >= 1 << 15 and self._task.typecode == 'h':
+                self._task = array('i', self._task)
+        return task_id
+
+    @property
+    def task_ids(self):
+        return np.frombuffer(self._task, dtype=self._task.typecode)
+
+    @property
+    def starts(self):
+        return np.frombuffer(self._start, dtype=np.int64)
+
+    @property
+    def ends(self):
+        return np.frombuffer(self._end, dtype=np.int64)
+
+    def unpin(self):
+        """Make sure appends work again even if column views are still alive"""
+        self._task = _unpinned(self._task)
+        self._start = _unpinned(self._start)
+        self._end = _unpinned(self._end)
+
+    def append(self, entry):
+        name, start, end = entry
+        task_id = self._ids.get(name)
+        self._task.append(self.task_id(name) if task_id is None else task_id)
+        self._start.append(start)
+        self._end.append(end)
+
+    def append_interval(self, entry):
+        """Append (name, start, end), extending the last interval if it continues it"""
+        name, start, end = entry
+        if self._end and self._end[-1] == start and self.names[self._task[-1]] == name:
+            self._end[-1] = end
+        else:
+            self.append(entry)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self):
+        return len(self._start)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return (self.names[self._task[index]], self._start[index], self._end[index])
+
+    def __iter__(self):
+        names = self.names
+        return ((names[task], start, end) for task, start, end in zip(self._task, self._start, self._end))
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"GanttTrace({len(self)} intervals, {len(self.names)} names)"
+
+def gantt_columns(gantt):
+    """(names, task_ids, starts, ends) for any gantt sequence; zero-copy for a GanttTrace"""
+    if not isinstance(gantt, GanttTrace):
+        gantt = GanttTrace(gantt)
+    return gantt.names, gantt.task_ids, gantt.starts, gantt.ends
@@ -0,0 +1,61 @@
+from collections.abc import Sequence
+from itertools import chain, islice
+from math import lcm
+
+def hyperperiod(tasks):
+    """LCM of the task periods, or None when the task set is not strictly periodic"""
+    periods = [task.period_ms for task in tasks]
+    if not periods or min(periods) <= 0:
+        return None
+    return lcm(*periods)
+
+class PeriodicTrace(Sequence):
+    """Read-only view of a trace whose data[start:stop] segment repeats `repeats` more times.
+
+    The simulated entries are `data`: everything up to `stop`, then the tail simulated after the
+    skipped cycles. Repeated entries are built on access, with the fields listed in `time_fields`
+    shifted by `cycle_ms` per repetition.
+    """
+    def __init__(self, data, start: int, stop: int, repeats: int, cycle_ms: int, time_fields=()):
+        self.data = data
+        self.start = start
+        self.stop = stop
+        self.repeats = repeats
+        self.cycle_ms = cycle_ms
+        self.time_fields = time_fields
+
+    def _shift(self, entry, offset: int):
+        if not self.time_fields:
+            return entry
+        return tuple(value + offset if i in self.time_fields else value
+                     for i, value in enumerate(entry))
+
+    def __len__(self):
+        return len(self.data) + (self.stop - self.start) * self.repeats
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("trace index out of range")
+        if index < self.stop:
+            return self.data[index]
+
+        extra = index - self.stop
+        segment = self.stop - self.start
+        if extra < segment * self.repeats:
+            k, offset = divmod(extra, segment)
+            return self._shift(self.data[self.start + offset], (k + 1) * self.cycle_ms)
+        return self.data[index - segment * self.repeats]
+
+    def __iter__(self):
+        head = islice(self.data, self.stop)
+        cycles = (self._shift(entry, (k + 1) * self.cycle_ms)
+                  for k in range(self.repeats) for entry in islice(self.data, self.start, self.stop))
+        tail = islice(self.data, self.stop, None)
+        return chain(head, cycles, tail)
+
+    def __repr__(self):
+        return f"PeriodicTrace({len(self)} entries, {self.repeats} repeats of {self.cycle_ms} ms)"
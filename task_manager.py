@@ -1,6 +1,7 @@
 from dataclasses import dataclass
+from task_table import TaskTable
 
-@dataclass
+@dataclass(slots=True)
 class TaskParams:
     period_ms: int
     exec_ms: int
@@ -8,28 +9,27 @@ class TaskParams:
 
 class TaskManager:
     def __init__(self):
-        self.tasks = {
+        # Shared with Scheduler and BenchmarkSimulator as is
+        self.tasks = TaskTable({
             "ADC": TaskParams(10, 2, 2),
             "Filter": TaskParams(30, 6, 1),
             "DataTX": TaskParams(20, 4, 3)
-        }
+        })
     
     def get_task_list(self):
-        return [
-            [name, params.period_ms, params.exec_ms, params.priority]
-            for name, params in self.tasks.items()
-        ]
+        return self.tasks.rows()
     
     def update_task(self, name, period_ms=None, exec_ms=None, priority=None):
         if name in self.tasks:
             if period_ms is not None:
-                self.tasks[name].period_ms = int(period_ms)
+                self.tasks.update(name, period_ms=int(period_ms))
             if exec_ms is not None:
-                self.tasks[name].exec_ms = int(exec_ms)
+                self.tasks.update(name, exec_ms=int(exec_ms))
             if priority is not None:
-                self.tasks[name].priority = int(priority)
+                self.tasks.update(name, priority=int(priority))
         else:
-            self.tasks[name] = TaskParams(
+            self.tasks.set(
+                name,
                 int(period_ms),
                 int(exec_ms),
                 int(priority)
@@ -37,14 +37,7 @@ class TaskManager:
     
     def remove_task(self, name):
         if name in self.tasks:
-            del self.tasks[name]
+            self.tasks.remove(name)
     
     def get_task_dict(self):
-        return {
-            name: {
-                "period_ms": params.period_ms,
-                "exec_ms": params.exec_ms,
-                "priority": params.priority
-            }
-            for name, params in self.tasks.items()
-        }
\ No newline at end of file
+        return dict(self.tasks.items())
@@ -0,0 +1,99 @@
+from array import array
+
+class TaskTable:
+    """Task parameters as parallel int64 arrays with a name index, in insertion order.
+
+    Shared by TaskManager, Scheduler and BenchmarkSimulator. Scheduler builds its runtime
+    Task records straight from the columns (to_tasks); items() also yields the
+    {"period_ms", "exec_ms", "priority"} dicts that task files and variations use.
+    """
+    __slots__ = ('names', 'period_ms', 'exec_ms', 'priority', '_index')
+
+    def __init__(self, params=None):
+        self.names = []
+        self.period_ms = array('q')
+        self.exec_ms = array('q')
+        self.priority = array('q')
+        self._index = {}
+        for name, p in (params or {}).items():
+            if isinstance(p, dict):
+                self.set(name, p["period_ms"], p["exec_ms"], p["priority"])
+            else:
+                self.set(name, p.period_ms, p.exec_ms, p.priority)
+
+    @classmethod
+    def of(cls, tasks):
+        """`tasks` itself if it already is a TaskTable, else a table built from it"""
+        return tasks if isinstance(tasks, cls) else cls(tasks)
+
+    def copy(self):
+        table = TaskTable()
+        table.names = list(self.names)
+        table.period_ms = array('q', self.period_ms)
+        table.exec_ms = array('q', self.exec_ms)
+        table.priority = array('q', self.priority)
+        table._index = dict(self._index)
+        return table
+
+    def set(self, name: str, period_ms: int, exec_ms: int, priority: int):
+        """Add a task at the end, or overwrite an existing one in place"""
+        i = self._index.get(name)
+        if i is None:
+            self._index[name] = len(self.names)
+            self.names.append(name)
+            self.period_ms.append(period_ms)
+            self.exec_ms.append(exec_ms)
+            self.priority.append(priority)
+        else:
+            self.period_ms[i] = period_ms
+            self.exec_ms[i] = exec_ms
+            self.priority[i] = priority
+
+    def update(self, name: str, **changes):
+        i = self._index[name]
+        for column, value in changes.items():
+            getattr(self, column)[i] = value
+
+    def remove(self, name: str):
+        i = self._index.pop(name)
+        del self.names[i]
+        del self.period_ms[i]
+        del self.exec_ms[i]
+        del self.priority[i]
+        for later in self.names[i:]:
+            self._index[later] -= 1
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def row(self, name: str):
+        """(period_ms, exec_ms, priority) of one task"""
+        i = self._index[name]
+        return self.period_ms[i], self.exec_ms[i], self.priority[i]
+
+    def rows(self):
+        """[name, period_ms, exec_ms, priority] per task"""
+        return [list(row) for row in zip(self.names, self.period_ms, self.exec_ms, self.priority)]
+
+    def items(self):
+        for name, period_ms, exec_ms, priority in zip(self.names, self.period_ms, self.exec_ms, self.priority):
+            yield name, {"period_ms": period_ms, "exec_ms": exec_ms, "priority": priority}
+
+    def to_tasks(self, overrides=None):
+        """Fresh scheduler Task records, with optional {name: {param: value}} overrides"""
+        from scheduler_sim import Task
+        tasks = {}
+        for name, period_ms, exec_ms, priority in zip(self.names, self.period_ms, self.exec_ms, self.priority):
+            if overrides and name in overrides:
+                changed = overrides[name]
+                period_ms = changed.get("period_ms", period_ms)
+                exec_ms = changed.get("exec_ms", exec_ms)
+                priority = changed.get("priority", priority)
+            tasks[name] = Task(name, period_ms, exec_ms, priority)
+        return tasks
@@ -0,0 +1,130 @@
+"""Every simulation path must produce the same schedule.
+
+The scheduling rules live in the inline loop (_run_inline, both engines), the hooked tick and
+event loops (instrumented and raw_ticks runs) and each policy's event_step. Random task sets
+are run through all of them, with steady-state extrapolation and resumed segments too, and
+must give the trace and metrics of the plain tick engine. Priority and Round Robin are also
+pinned to data/original_tick_loop.jsonl: the per-tick log and metrics of the simulator's
+original Scheduler.run loop (before the event engine, ready queues and compact traces), with
+runs of consecutive ticks merged into one [name, start, end] entry.
+"""
+import contextlib
+import io
+import json
+import os
+import random
+
+import pytest
+
+from scheduler_sim import Scheduler, SchedulerType, SchedulingMode, SimulationEngine, Task
+
+GOLDEN = os.path.join(os.path.dirname(__file__), "data", "original_tick_loop.jsonl")
+
+# (engine, raw_ticks, instrument, steady_state, segments) compared against the plain tick engine
+VARIANTS = [
+    (engine, raw_ticks, instrument, steady_state, segments)
+    for engine in SimulationEngine
+    for raw_ticks, instrument, steady_state, segments in (
+        (False, False, False, 1),
+        (True, False, False, 1),
+        (False, True, False, 1),
+        (False, False, True, 1),
+        (False, False, False, 7),
+        (False, True, True, 3),
+    )
+]
+
+def merged(intervals):
+    """Intervals with empty slices dropped and back-to-back ones of the same task joined"""
+    out = []
+    for entry in intervals:
+        *key, start, end = entry
+        if start == end:
+            continue
+        if out and out[-1][:-2] == key and out[-1][-1] == start:
+            out[-1][-1] = end
+        else:
+            out.append([*key, start, end])
+    return out
+
+def outcome(scheduler):
+    """Everything a run produced, in a form independent of trace compaction"""
+    metrics = scheduler.metrics
+    return {
+        "gantt": merged(scheduler.gantt_log),
+        "executions": {name: merged(task.executions) for name, task in scheduler.tasks.items()},
+        "buffer_state": list(metrics["buffer_state"]),
+        "task_jitter": {name: list(jitter) for name, jitter in metrics["task_jitter"].items()},
+        "cpu_busy": metrics["cpu_busy"],
+        "cpu_idle": metrics["cpu_idle"],
+        "deadlines_missed": metrics["deadlines_missed"],
+        "task_missed": {name: task.deadline_missed for name, task in scheduler.tasks.items()},
+        "current_time": scheduler.current_time,
+    }
+
+def simulate(task_rows, duration, sched_type, mode, engine=SimulationEngine.TICK, raw_ticks=False,
+             instrument=False, steady_state=False, segments=1, rr_quantum=1):
+    tasks = {name: Task(name, period, exec_ms, priority) for name, period, exec_ms, priority in task_rows}
+    scheduler = Scheduler(tasks, engine=engine, raw_ticks=raw_ticks, instrument=instrument,
+                          steady_state=steady_state, rr_quantum=rr_quantum)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if segments == 1:
+            scheduler.run(duration, sched_type, mode)
+        else:
+            list(scheduler.run_steps(duration, sched_type, mode, steps=segments))
+    return scheduler
+
+def random_task_set(seed):
+    rng = random.Random(seed)
+    rows = [(f"T{j}", rng.choice([2, 3, 4, 5, 6, 8, 10, 12, 20]), rng.choice([0] + [1, 2, 3, 4, 5, 6] * 3),
+             rng.randint(1, 5)) for j in range(rng.randint(1, 6))]
+    return rows, rng.randint(1, 250)
+
+POLICIES = [(sched_type, mode, 1) for sched_type in SchedulerType for mode in SchedulingMode]
+POLICIES += [(SchedulerType.ROUND_ROBIN, SchedulingMode.PREEMPTIVE, quantum) for quantum in (2, 3)]
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("sched_type, mode, quantum", POLICIES,
+                         ids=[f"{s.name}-{m.name}-q{q}" for s, m, q in POLICIES])
+def test_engines_match_tick_engine(seed, sched_type, mode, quantum):
+    rows, duration = random_task_set(seed)
+    reference = outcome(simulate(rows, duration, sched_type, mode, rr_quantum=quantum))
+    for engine, raw_ticks, instrument, steady_state, segments in VARIANTS:
+        scheduler = simulate(rows, duration, sched_type, mode, engine, raw_ticks, instrument,
+                             steady_state, segments, rr_quantum=quantum)
+        assert outcome(scheduler) == reference, (engine, raw_ticks, instrument, steady_state, segments)
+
+def load_golden():
+    with open(GOLDEN) as f:
+        return [json.loads(line) for line in f]
+
+def expand(gantt):
+    """The original per-tick log from merged [name, start, end] runs (empty slices kept)"""
+    log = []
+    for name, start, end in gantt:
+        log.extend([(name, start, end)] if start == end else [(name, t, t + 1) for t in range(start, end)])
+    return log
+
+@pytest.mark.parametrize("case", load_golden(),
+                         ids=lambda case: f"{case['sched_type']}-{case['mode']}-{case['duration']}ms")
+def test_matches_original_tick_loop(case):
+    sched_type, mode = SchedulerType[case["sched_type"]], SchedulingMode[case["mode"]]
+    raw_log = expand(case["gantt"])
+    expected = {
+        "gantt": merged(raw_log),
+        "executions": {name: merged([(s, e) for n, s, e in raw_log if n == name]) for name, *_ in case["tasks"]},
+        "buffer_state": case["buffer_state"],
+        "task_jitter": case["task_jitter"],
+        "cpu_busy": case["cpu_busy"],
+        "cpu_idle": case["cpu_idle"],
+        "deadlines_missed": case["deadlines_missed"],
+        "task_missed": case["task_missed"],
+        "current_time": case["duration"],
+    }
+    for engine in SimulationEngine:
+        scheduler = simulate(case["tasks"], case["duration"], sched_type, mode, engine)
+        assert outcome(scheduler) == expected, engine
+
+    # raw_ticks reproduces the original log entry for entry
+    scheduler = simulate(case["tasks"], case["duration"], sched_type, mode, raw_ticks=True)
+    assert list(scheduler.gantt_log) == raw_log
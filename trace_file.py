@@ -0,0 +1,164 @@
+import struct
+from array import array
+import numpy as np
+from sim_trace import GanttTrace, gantt_columns
+
+# Binary trace layout (little endian):
+#   header   magic, version, record count, block size, index offset, name table offset
+#   records  fixed-width (task id, start, end) rows, in time order
+#   index    per block of `block size` records: first start and running max of the ends
+#   names    task name table, u16 length + UTF-8 bytes per name, in id order
+# The header is rewritten on close, so records can be streamed before the names are known.
+MAGIC = b"SCHTRACE"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQQQ")
+RECORD_DTYPE = np.dtype([("task", "<u2"), ("start", "<i8"), ("end", "<i8")])  # 18 bytes, unaligned
+INDEX_DTYPE = np.dtype([("first_start", "<i8"), ("max_end", "<i8")])
+
+class TraceWriter:
+    """Streams (name, start, end) intervals to a binary trace file, one block at a time"""
+    def __init__(self, filename: str, block_size: int = 4096):
+        self.filename = filename
+        self.block_size = block_size
+        self._file = open(filename, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, 0, block_size, 0, 0))
+        self._names = []
+        self._ids = {}
+        self._count = 0
+        self._index = []
+        self._max_end = None
+        self._task = array("H")
+        self._start = array("q")
+        self._end = array("q")
+
+    def _task_id(self, name: str) -> int:
+        task_id = self._ids.get(name)
+        if task_id is None:
+            if len(self._names) > 0xFFFF:
+                raise ValueError("Binary traces hold at most 65536 task names")
+            task_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return task_id
+
+    def append(self, entry):
+        name, start, end = entry
+        self._task.append(self._task_id(name))
+        self._start.append(start)
+        self._end.append(end)
+        if len(self._task) == self.block_size:
+            self._flush()
+
+    def extend(self, entries):
+        """Add many intervals; a GanttTrace is copied column-wise without building tuples"""
+        if not isinstance(entries, GanttTrace):
+            for entry in entries:
+                self.append(entry)
+            return
+        names, task_ids, starts, ends = gantt_columns(entries)
+        ids = np.array([self._task_id(name) for name in names], dtype=np.uint16)[task_ids]
+        pos = 0
+        while pos < len(starts):
+            chunk = slice(pos, pos + self.block_size - len(self._task))
+            self._task.extend(ids[chunk].tolist())
+            self._start.extend(starts[chunk].tolist())
+            self._end.extend(ends[chunk].tolist())
+            pos = chunk.stop
+            if len(self._task) == self.block_size:
+                self._flush()
+
+    def _flush(self):
+        """Write the buffered records as one block and index it"""
+        if not self._task:
+            return
+        block = np.empty(len(self._task), dtype=RECORD_DTYPE)
+        block["task"] = self._task
+        block["start"] = self._start
+        block["end"] = self._end
+        block_max = int(block["end"].max())
+        self._max_end = block_max if self._max_end is None else max(self._max_end, block_max)
+        self._index.append((self._start[0], self._max_end))
+        self._file.write(block.tobytes())
+        self._count += len(block)
+        self._task = array("H")
+        self._start = array("q")
+        self._end = array("q")
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush()
+        index_offset = self._file.tell()
+        self._file.write(np.array(self._index, dtype=INDEX_DTYPE).tobytes())
+        names_offset = self._file.tell()
+        for name in self._names:
+            encoded = name.encode("utf-8")
+            self._file.write(struct.pack("<H", len(encoded)) + encoded)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, self._count, self.block_size,
+                                      index_offset, names_offset))
+        self._file.close()
+
+    def finish(self, scheduler):
+        """Trace sink hook (Scheduler(trace_sink=...)): the binary trace holds no summary"""
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class TraceReader:
+    """Memory-mapped view of a binary trace; only the blocks a query touches are read"""
+    def __init__(self, filename: str):
+        with open(filename, "rb") as f:
+            magic, version, count, block_size, index_offset, names_offset = _HEADER.unpack(
+                f.read(_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{filename} is not a version {VERSION} scheduler trace")
+            f.seek(names_offset)
+            table = f.read()
+        self.names = []
+        pos = 0
+        while pos < len(table):
+            (length,) = struct.unpack_from("<H", table, pos)
+            self.names.append(table[pos + 2:pos + 2 + length].decode("utf-8"))
+            pos += 2 + length
+
+        self.block_size = block_size
+        self.records = np.memmap(filename, dtype=RECORD_DTYPE, mode="r", offset=_HEADER.size,
+                                 shape=(count,)) if count else np.empty(0, dtype=RECORD_DTYPE)
+        blocks = (count + block_size - 1) // block_size
+        self.index = np.memmap(filename, dtype=INDEX_DTYPE, mode="r", offset=index_offset,
+                               shape=(blocks,)) if blocks else np.empty(0, dtype=INDEX_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        task, start, end = self.records[index].tolist()
+        return (self.names[task], start, end)
+
+    def __iter__(self):
+        names = self.names
+        for offset in range(0, len(self.records), self.block_size):
+            for task, start, end in self.records[offset:offset + self.block_size].tolist():
+                yield (names[task], start, end)
+
+    def query(self, start: int, end: int):
+        """Records (structured array) of intervals overlapping [start, end)"""
+        first_block = np.searchsorted(self.index["max_end"], start, side="right")
+        last_block = np.searchsorted(self.index["first_start"], end, side="left")
+        records = self.records[first_block * self.block_size:last_block * self.block_size]
+        return records[(records["end"] > start) & (records["start"] < end)]
+
+    def intervals(self, start: int, end: int):
+        """(name, start, end) tuples overlapping [start, end)"""
+        return [(self.names[task], s, e) for task, s, e in self.query(start, end).tolist()]
+
+    def gantt(self, start=None, end=None) -> GanttTrace:
+        """The whole trace, or the part overlapping [start, end), as an in-memory GanttTrace"""
+        if start is None and end is None:
+            return GanttTrace(self)
+        return GanttTrace(self.intervals(start if start is not None else -2 ** 63,
+                                         end if end is not None else 2 ** 63 - 1))
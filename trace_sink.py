@@ -0,0 +1,87 @@
+import csv
+import gzip
+import io
+
+class DiscardLog(list):
+    """Task.executions stand-in for streamed runs: stays empty whatever is appended"""
+    def append(self, entry):
+        pass
+
+    def extend(self, entries):
+        pass
+
+class StreamedGantt:
+    """Scheduler.gantt_log stand-in that passes finished intervals to a sink.
+
+    Only the last interval is held, since the next slice may still extend it; flush()
+    hands it over at the end of the run. The trace itself cannot be read back.
+    """
+    def __init__(self, sink):
+        self.sink = sink
+        self._last = None
+        self._count = 0
+
+    def append(self, entry):
+        if self._last is not None:
+            self.sink.append(self._last)
+        self._last = entry
+        self._count += 1
+
+    def append_interval(self, entry):
+        """Append (name, start, end), extending the last interval if it continues it"""
+        last = self._last
+        if last is not None and last[2] == entry[1] and last[0] == entry[0]:
+            self._last = (last[0], last[1], entry[2])
+        else:
+            self.append(entry)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def flush(self):
+        if self._last is not None:
+            self.sink.append(self._last)
+            self._last = None
+
+    def unpin(self):
+        pass
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __iter__(self):
+        raise TypeError("A streamed trace is written to its sink, not kept in memory")
+
+    __getitem__ = __iter__
+
+class CsvTraceSink:
+    """Writes Scheduler.export_csv's layout while the run is going: gantt rows as they are
+    finalized, then the metrics and per-task sections in finish().
+
+    Output goes through a `buffer_size` write buffer; compress=None gzips *.gz filenames.
+    """
+    def __init__(self, filename: str, compress=None, buffer_size: int = 1 << 20):
+        if compress is None:
+            compress = filename.endswith(".gz")
+        if compress:
+            raw = io.BufferedWriter(gzip.GzipFile(filename, "wb"), buffer_size)
+            self._file = io.TextIOWrapper(raw, newline="")
+        else:
+            self._file = open(filename, "w", newline="", buffering=buffer_size)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(["Task", "Start", "End"])
+        self.append = self._writer.writerow
+
+    def extend(self, entries):
+        self._writer.writerows(entries)
+
+    def finish(self, scheduler):
+        """Append the summary sections for the finished run and close the file"""
+        try:
+            scheduler.write_csv_summary(self._writer)
+        finally:
+            self._file.close()